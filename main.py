@@ -3,7 +3,6 @@ Entry point for the Donizo pricing engine.
 """
 
 import os
-import json
 from pathlib import Path
 from dotenv import load_dotenv
 from src.engine import DonizoPricingEngine
@@ -57,12 +56,7 @@ def main():
 
     print("Saving quote to output/sample_quote.json...")
 
-    quote_dict = quote.model_dump()
-
-    quote_dict["created_at"] = quote_dict["created_at"].isoformat()
-
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(quote_dict, f, indent=2, ensure_ascii=False)
+    output_file.write_text(quote.model_dump_json(indent=2), encoding='utf-8')
 
     print(f"Quote saved to {output_file}")
     print()
@@ -0,0 +1,54 @@
+"""On-disk cache for OpenAI responses shared across runs."""
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+CACHE_DIR = Path(os.getenv("DONIZO_CACHE_DIR",
+                           Path.home() / ".cache" / "donizo"))
+
+
+def cache_key(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class DiskCache:
+    def __init__(self, name: str):
+        self.path = CACHE_DIR / f"{name}.json"
+        self._entries: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Any]:
+        if self._entries is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    entries = json.load(f)
+            except Exception:
+                entries = None
+            # Entries are plain JSON, so a tampered file is only ever data
+            self._entries = entries if isinstance(entries, dict) else {}
+        return self._entries
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            return self._load().get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        self.update({key: value})
+
+    def update(self, values: Dict[str, Any]) -> None:
+        with self._lock:
+            entries = self._load()
+            entries.update(values)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix(".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(entries, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Could not persist cache {self.path}: {e}")
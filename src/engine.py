@@ -1,14 +1,192 @@
+import re
+import math
 import uuid
+import asyncio
 import json
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
-from src.models import Quote, Zone, Task, TaskType, TranscriptAnalysis
+from string import Template
+from typing import Dict, List, Optional, Tuple
+from src.models import (Quote, Zone, Task, TaskType, TranscriptAnalysis, Labor,
+                        BUDGET_CODES, DEFAULT_BUDGET_CODE)
 from src.pricing.material_db import MaterialDatabase
 from src.pricing.labor_calc import LaborCalculator
 from src.pricing.vat_rules import VATCalculator
 from src.pricing.confidence import ConfidenceScorer
 from src.transcript.analyzer import TranscriptAnalyzer
-from src.openai_client import openai_client, DEFAULT_MODEL
+from openai import AsyncOpenAI
+from src.openai_client import (
+    openai_client, async_openai_client, create_async_client, DEFAULT_MODEL)
+from src.cache import DiskCache, cache_key
+from src import fast
+
+
+_TASK_TYPE_VALUES = tuple(task_type.value for task_type in TaskType)
+_TASK_TYPE_VALUES_CSV = ", ".join(_TASK_TYPE_VALUES)
+_TASK_TYPE_BY_VALUE = {task_type.value: task_type for task_type in TaskType}
+
+_COMPLEXITY_LEVELS = ("simple", "moderate", "complex")
+_COMPLEXITY_CODES = {level: code for code, level in enumerate(_COMPLEXITY_LEVELS)}
+_DEFAULT_COMPLEXITY_CODE = _COMPLEXITY_CODES["moderate"]
+
+_COMPLEX_TASKS = frozenset({"plumbing", "electrical", "waterproofing"})
+
+# Indexed by complexity code: simple, moderate, complex
+_COMPLEXITY_ADJUSTMENTS = (0.0, 0.02, 0.05)
+_COMPLEXITY_MULTIPLIERS = (1.0, 1.2, 1.5)
+
+# Indexed by budget code: budget-conscious, moderate, premium, luxury
+_BUDGET_ADJUSTMENTS = (-0.02, 0.0, 0.05, 0.10)
+_BUDGET_VARIANTS = ("basic", "basic", "premium", "luxury")
+
+_BASE_TASK_CONFIDENCE = {
+    "painting": 0.9,
+    "demolition": 0.85,
+    "tiling": 0.8,
+    "fixtures": 0.75,
+    "plumbing": 0.7,
+    "electrical": 0.7,
+    "waterproofing": 0.65
+}
+
+_TASK_PLAN_SYSTEM_PROMPT = f"""
+You are an expert renovation task classifier and planner for Donizo, a French renovation company.
+Your job is to map renovation task names to standardized task types and keys, and to suggest
+default tasks when none were identified.
+
+Available task types: {_TASK_TYPE_VALUES_CSV}
+
+Respond with a JSON object with two fields:
+- mapping: an object where each key is an original task name and the value is an object with:
+  - task_key: a standardized internal key (lowercase, underscore-separated)
+  - task_type: one of the available task types above
+- defaults: an array of task objects, each with:
+  - name: descriptive task name (in English)
+  - task_key: standardized internal key (lowercase, underscore-separated)
+  - task_type: one of the available task types
+
+Classification guidelines:
+- Use the most appropriate task type from the available options
+- task_key should be a clean, standardized version suitable for internal processing
+- If a task doesn't fit perfectly, choose the closest match
+- For demolition tasks: use "demolition" 
+- For plumbing tasks: use "plumbing"
+- For electrical tasks: use "electrical"
+- For tiling/ceramic work: use "tiling"
+- For painting: use "painting"
+- For flooring installation: use "flooring"
+- For fixture installation: use "fixtures"
+- For waterproofing: use "waterproofing"
+
+Default task guidelines:
+- Only fill defaults when no task names are provided; otherwise return an empty array
+- Consider room type and size, budget preference, typical renovation workflow,
+  French renovation standards and a logical task sequence
+- Suggest 4-6 essential tasks for a typical renovation
+"""
+
+_TASK_PLAN_CONTEXT_TEMPLATE = Template("""
+Project context:
+- Room: $room_type (${room_size}sqm)
+- Location: $location
+- Budget: $budget
+- Special requirements: $special_requirements
+""")
+
+_FALLBACK_TASK_MAPPING = {
+    "remove tiles": {"task_key": "demolition", "task_type": "demolition"},
+    "tile removal": {"task_key": "demolition", "task_type": "demolition"},
+    "demolition": {"task_key": "demolition", "task_type": "demolition"},
+    "plumbing": {"task_key": "plumbing", "task_type": "plumbing"},
+    "plumbing work": {"task_key": "plumbing", "task_type": "plumbing"},
+    "redo plumbing": {"task_key": "plumbing", "task_type": "plumbing"},
+    "electrical": {"task_key": "electrical", "task_type": "electrical"},
+    "electrical work": {"task_key": "electrical", "task_type": "electrical"},
+    "tiling": {"task_key": "tiling", "task_type": "tiling"},
+    "tile installation": {"task_key": "tiling", "task_type": "tiling"},
+    "lay tiles": {"task_key": "tiling", "task_type": "tiling"},
+    "painting": {"task_key": "painting", "task_type": "painting"},
+    "paint": {"task_key": "painting", "task_type": "painting"},
+    "repaint": {"task_key": "painting", "task_type": "painting"},
+    "flooring": {"task_key": "flooring", "task_type": "flooring"},
+    "install fixtures": {"task_key": "fixtures", "task_type": "fixtures"},
+    "fixture installation": {"task_key": "fixtures", "task_type": "fixtures"},
+    "install vanity": {"task_key": "fixtures", "task_type": "fixtures"},
+    "install toilet": {"task_key": "fixtures", "task_type": "fixtures"}
+}
+
+_FALLBACK_TASK_RE = re.compile(r"\b(" + "|".join(
+    re.escape(name) for name in sorted(_FALLBACK_TASK_MAPPING, key=len, reverse=True)
+) + r")\b")
+
+# No market data yet, so every material gets the same stability/reliability
+_PRICE_STABILITY = 0.8
+_SUPPLIER_RELIABILITY = 0.85
+
+_task_plan_cache = DiskCache("task_plans")
+
+
+def _task_plan_request(frozen_names: frozenset, project_context: Optional[tuple]) -> Dict:
+    user_prompt = f"""
+Please classify these renovation tasks:
+{json.dumps(sorted(frozen_names))}
+"""
+    if project_context:
+        room_type, room_size, location, budget, special_requirements = project_context
+        user_prompt += _TASK_PLAN_CONTEXT_TEMPLATE.substitute(
+            room_type=room_type,
+            room_size=room_size,
+            location=location,
+            budget=budget,
+            special_requirements=list(special_requirements)
+        )
+    user_prompt += "\nReturn only valid JSON.\n"
+
+    return {
+        "model": DEFAULT_MODEL,
+        "messages": [
+            {"role": "system", "content": _TASK_PLAN_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ],
+        "temperature": 0.1,
+        "max_tokens": 1200,
+        "response_format": {"type": "json_object"}
+    }
+
+
+def _task_plan_key(frozen_names: frozenset, project_context: Optional[tuple]) -> str:
+    # Prompt edits change the reply format, so they must not hit old plans
+    return cache_key(DEFAULT_MODEL, _TASK_PLAN_SYSTEM_PROMPT, _TASK_PLAN_CONTEXT_TEMPLATE.template,
+                     sorted(frozen_names), project_context)
+
+
+def _store_task_plan(key: str, response) -> Dict:
+    # JSON mode guarantees an object root; a malformed reply raises here so it
+    # is never cached
+    plan = json.loads(response.choices[0].message.content)
+    _task_plan_cache.set(key, plan)
+    return plan
+
+
+@functools.lru_cache(maxsize=4096)
+def _plan_tasks_cached(frozen_names: frozenset, project_context: Optional[tuple]) -> Dict:
+    key = _task_plan_key(frozen_names, project_context)
+    plan = _task_plan_cache.get(key)
+    if plan is None:
+        plan = _store_task_plan(key, openai_client.chat.completions.create(
+            **_task_plan_request(frozen_names, project_context)))
+    return plan
+
+
+async def _plan_tasks_async(frozen_names: frozenset, project_context: Optional[tuple],
+                            client: Optional[AsyncOpenAI] = None) -> Dict:
+    key = _task_plan_key(frozen_names, project_context)
+    plan = _task_plan_cache.get(key)
+    if plan is None:
+        plan = _store_task_plan(key, await (client or async_openai_client).chat.completions.create(
+            **_task_plan_request(frozen_names, project_context)))
+    return plan
 
 
 class DonizoPricingEngine:
@@ -19,15 +197,62 @@ class DonizoPricingEngine:
         self.confidence_scorer = ConfidenceScorer()
         self.transcript_analyzer = TranscriptAnalyzer()
 
+        if fast.JIT_ENABLED:
+            # Pay the compile cost up front instead of on the first quote
+            fast.warm_up()
+
     def generate_quote_from_transcript(self, transcript: str,
                                        override_location: Optional[str] = None) -> Quote:
         analysis = self.transcript_analyzer.analyze_transcript(transcript)
         if override_location:
             analysis.location = override_location
 
+        task_plan = self._plan_tasks_with_openai(analysis)
+
+        return self._build_quote(analysis, transcript, task_plan)
+
+    async def agenerate_quote_from_transcript(self, transcript: str,
+                                              override_location: Optional[str] = None,
+                                              client: Optional[AsyncOpenAI] = None) -> Quote:
+        if client is None:
+            # Callers may run each quote under its own asyncio.run loop, which
+            # can't reuse a connection pool opened on another loop
+            async with create_async_client() as client:
+                return await self.agenerate_quote_from_transcript(
+                    transcript, override_location, client)
+
+        analysis = await self.transcript_analyzer.analyze_transcript_async(transcript, client)
+        if override_location:
+            analysis.location = override_location
+
+        task_plan = await self._plan_tasks_with_openai_async(analysis, client)
+
+        task_mappings, default_tasks = task_plan
+        await self.labor_calc.anormalize_task_names(
+            [task_key for _, task_key, _ in self._task_specs(analysis, task_mappings)] +
+            [task_key for _, task_key, _ in default_tasks], client)
+
+        # Pricing is CPU-bound, so keep it off the event loop; labor names
+        # normalized above are cache hits there
+        return await asyncio.to_thread(self._build_quote, analysis, transcript, task_plan)
+
+    async def agenerate_quotes(self, transcripts: List[str],
+                               max_concurrency: int = 32) -> List[Quote]:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async with create_async_client() as client:
+            async def generate(transcript: str) -> Quote:
+                async with semaphore:
+                    return await self.agenerate_quote_from_transcript(transcript, client=client)
+
+            return await asyncio.gather(*(generate(transcript) for transcript in transcripts))
+
+    def _build_quote(self, analysis: TranscriptAnalysis, transcript: str,
+                     task_plan: Tuple[Dict[str, Dict[str, str]], List[tuple]]) -> Quote:
         project_context = {
             "location": analysis.location,
             "project_description": transcript,
+            "energy_renovation_described": self.vat_calc.describes_energy_renovation(transcript),
             "budget_preference": analysis.budget_preference,
             "special_requirements": analysis.special_requirements,
             "building_age_years": 10,
@@ -35,28 +260,37 @@ class DonizoPricingEngine:
         }
 
         tasks = self._generate_tasks(
-            analysis, project_context)
+            analysis, project_context, task_plan)
+
+        zone_total = zone_confidence = total_before_vat = total_vat = 0.0
+        materials_list = []
+        for task in tasks:
+            zone_total += task.total_price
+            zone_confidence += task.confidence_score
+            total_before_vat += task.subtotal
+            total_vat += task.vat_amount
+            materials_list.extend(
+                (material.availability_score, _PRICE_STABILITY, _SUPPLIER_RELIABILITY)
+                for material in task.materials
+            )
 
         bathroom_zone = Zone(
             name="bathroom",
             area=analysis.room_size,
             tasks=tasks,
-            zone_total=sum(task.total_price for task in tasks),
-            zone_confidence=sum(
-                task.confidence_score for task in tasks) / len(tasks) if tasks else 0.5
+            zone_total=zone_total,
+            zone_confidence=zone_confidence / len(tasks) if tasks else 0.5
         )
 
-        total_before_vat = sum(task.subtotal for task in tasks)
-        total_vat = sum(task.vat_amount for task in tasks)
         grand_total = total_before_vat + total_vat
 
         confidence_data = self._prepare_confidence_data(
-            analysis, tasks, project_context)
+            analysis, materials_list, project_context)
         global_confidence, confidence_breakdown = self.confidence_scorer.calculate_confidence(
             confidence_data)
 
         quote = Quote(
-            quote_id=str(uuid.uuid4()),
+            quote_id=uuid.uuid4().hex,
             client_location=analysis.location,
             project_summary=self._create_project_summary(analysis),
             zones={"bathroom": bathroom_zone},
@@ -68,256 +302,190 @@ class DonizoPricingEngine:
 
         return quote
 
-    def _generate_tasks(self, analysis: TranscriptAnalysis,
-                        project_context: Dict) -> List[Task]:
-        tasks = []
+    def _generate_tasks(self, analysis: TranscriptAnalysis, project_context: Dict,
+                        task_plan: Tuple[Dict[str, Dict[str, str]], List[tuple]]) -> List[Task]:
+        task_mappings, default_tasks = task_plan
 
-        task_mappings = self._map_tasks_with_openai(analysis.tasks_identified)
+        task_specs = self._task_specs(analysis, task_mappings)
+        tasks = self._create_tasks(task_specs, analysis, project_context)
+
+        if not tasks:
+            tasks = self._create_tasks(
+                default_tasks or self._default_tasks(), analysis, project_context)
 
+        return tasks
+
+    def _task_specs(self, analysis: TranscriptAnalysis,
+                    task_mappings: Dict[str, Dict[str, str]]) -> List[tuple]:
+        task_specs = []
         for task_name in analysis.tasks_identified:
             task_mapping = task_mappings.get(task_name)
             if task_mapping:
                 task_key = task_mapping["task_key"]
-                task_type = TaskType(task_mapping["task_type"])
+                task_type = _TASK_TYPE_BY_VALUE.get(
+                    task_mapping["task_type"], TaskType.FIXTURES)
             else:
                 task_key = task_name.lower()
                 task_type = TaskType.FIXTURES
 
-            task = self._create_task(
-                name=task_name,
-                task_type=task_type,
-                task_key=task_key,
-                analysis=analysis,
-                project_context=project_context
-            )
-
-            if task:
-                tasks.append(task)
+            task_specs.append((task_name, task_key, task_type))
+
+        return task_specs
+
+    def _create_tasks(self, task_specs: List[tuple], analysis: TranscriptAnalysis,
+                      project_context: Dict) -> List[Task]:
+        if not task_specs:
+            return []
+
+        # Labor for the whole quote is estimated in one batch up front, which
+        # also normalizes every task name in a single round trip
+        complexity_codes = [
+            self._determine_complexity_code(task_key, analysis)
+            for _, task_key, _ in task_specs
+        ]
+        labors = self.labor_calc.calculate_labor_batch(
+            [task_key for _, task_key, _ in task_specs],
+            [analysis.room_size] * len(task_specs),
+            [_COMPLEXITY_LEVELS[code] for code in complexity_codes],
+            [1.0] * len(task_specs)
+        )
 
-        if not tasks:
-            default_tasks = self._generate_default_tasks_with_openai(analysis)
-
-            for task_name, task_key, task_type in default_tasks:
-                task = self._create_task(
-                    name=task_name,
-                    task_type=task_type,
-                    task_key=task_key,
-                    analysis=analysis,
-                    project_context=project_context
-                )
-                if task:
-                    tasks.append(task)
+        # Tasks are priced independently, so run them concurrently and
+        # collect the results in submission order
+        with ThreadPoolExecutor(max_workers=min(8, len(task_specs))) as executor:
+            futures = [
+                executor.submit(self._create_task, task_name, task_type,
+                                task_key, analysis, project_context,
+                                complexity_code, labor)
+                for (task_name, task_key, task_type), complexity_code, labor
+                in zip(task_specs, complexity_codes, labors)
+            ]
+            results = [future.result() for future in futures]
 
-        return tasks
+        return [task for task in results if task]
 
-    def _map_tasks_with_openai(self, task_names: List[str]) -> Dict[str, Dict[str, str]]:
-        if not task_names:
-            return {}
+    def _plan_tasks_with_openai(self, analysis: TranscriptAnalysis) -> Tuple[Dict[str, Dict[str, str]], List[tuple]]:
+        known_mappings, normalized_names, project_context = self._prepare_task_plan(
+            analysis)
+        if analysis.tasks_identified and not normalized_names:
+            return known_mappings, []
 
         try:
-            # Define available task types from the enum
-            available_task_types = [task_type.value for task_type in TaskType]
-
-            system_prompt = f"""
-You are an expert renovation task classifier for Donizo, a French renovation company.
-Your job is to map renovation task names to standardized task types and keys.
-
-Available task types: {', '.join(available_task_types)}
-
-For each task name provided, return a JSON object with:
-- task_key: a standardized internal key (lowercase, underscore-separated)
-- task_type: one of the available task types above
-
-Guidelines:
-- Use the most appropriate task type from the available options
-- task_key should be a clean, standardized version suitable for internal processing
-- If a task doesn't fit perfectly, choose the closest match
-- For demolition tasks: use "demolition" 
-- For plumbing tasks: use "plumbing"
-- For electrical tasks: use "electrical"
-- For tiling/ceramic work: use "tiling"
-- For painting: use "painting"
-- For flooring installation: use "flooring"
-- For fixture installation: use "fixtures"
-- For waterproofing: use "waterproofing"
-
-Respond with a JSON object where each key is the original task name and the value is an object with task_key and task_type.
-"""
-
-            user_prompt = f"""
-Please classify these renovation tasks:
-{json.dumps(task_names)}
-
-Return only valid JSON.
-"""
-
-            response = openai_client.chat.completions.create(
-                model=DEFAULT_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.1,
-                max_tokens=800
-            )
-
-            response_text = response.choices[0].message.content
-
-            # Parse JSON response
-            json_start = response_text.find('{')
-            json_end = response_text.rfind('}') + 1
-
-            if json_start != -1 and json_end != -1:
-                json_text = response_text[json_start:json_end]
-                return json.loads(json_text)
-            else:
-                return json.loads(response_text)
-
+            plan = _plan_tasks_cached(normalized_names, project_context)
         except Exception as e:
-            print(f"Error mapping tasks with OpenAI: {e}")
-            # Fallback to simple mapping
-            return self._fallback_task_mapping(task_names)
-
-    def _generate_default_tasks_with_openai(self, analysis: TranscriptAnalysis) -> List[tuple]:
-        try:
-            available_task_types = [task_type.value for task_type in TaskType]
-
-            system_prompt = f"""
-You are an expert renovation planner for Donizo, a French renovation company.
-Based on the project context, suggest appropriate renovation tasks.
+            return self._fallback_task_plan(analysis, e)
 
-Available task types: {', '.join(available_task_types)}
+        return self._resolve_task_plan(analysis.tasks_identified, known_mappings, plan)
 
-Return a JSON array of task objects, each with:
-- name: descriptive task name (in English)
-- task_key: standardized internal key (lowercase, underscore-separated)  
-- task_type: one of the available task types
+    async def _plan_tasks_with_openai_async(self, analysis: TranscriptAnalysis,
+                                            client: Optional[AsyncOpenAI] = None) -> Tuple[Dict[str, Dict[str, str]], List[tuple]]:
+        known_mappings, normalized_names, project_context = self._prepare_task_plan(
+            analysis)
+        if analysis.tasks_identified and not normalized_names:
+            return known_mappings, []
 
-Consider:
-- Room type and size
-- Budget preference
-- Typical renovation workflow
-- French renovation standards
-- Logical task sequence
-
-Suggest 4-6 essential tasks for a typical renovation.
-"""
-
-            user_prompt = f"""
-Generate default renovation tasks for this project:
-- Room: {analysis.room_type} ({analysis.room_size}sqm)
-- Location: {analysis.location}
-- Budget: {analysis.budget_preference}
-- Special requirements: {analysis.special_requirements}
-
-Return only a JSON array.
-"""
+        try:
+            plan = await _plan_tasks_async(normalized_names, project_context, client)
+        except Exception as e:
+            return self._fallback_task_plan(analysis, e)
 
-            response = openai_client.chat.completions.create(
-                model=DEFAULT_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.2,
-                max_tokens=600
-            )
+        return self._resolve_task_plan(analysis.tasks_identified, known_mappings, plan)
 
-            response_text = response.choices[0].message.content
+    def _fallback_task_plan(self, analysis: TranscriptAnalysis,
+                            error: Exception) -> Tuple[Dict[str, Dict[str, str]], List[tuple]]:
+        print(f"Error planning tasks with OpenAI: {error}")
+        # Fallback to simple mapping
+        return self._fallback_task_mapping(analysis.tasks_identified), []
 
-            json_start = response_text.find('[')
-            json_end = response_text.rfind(']') + 1
+    def _prepare_task_plan(self, analysis: TranscriptAnalysis) -> Tuple[Dict[str, Dict[str, str]], frozenset, Optional[tuple]]:
+        # Names already in the fallback table are resolved locally; only the
+        # rest are sent to OpenAI
+        known_mappings = {}
+        unknown_names = set()
+        for task_name in analysis.tasks_identified:
+            task_name_lower = task_name.lower().strip()
+            mapping = _FALLBACK_TASK_MAPPING.get(task_name_lower)
+            if mapping:
+                known_mappings[task_name] = mapping
+            else:
+                unknown_names.add(task_name_lower)
 
-            if json_start != -1 and json_end != -1:
-                json_text = response_text[json_start:json_end]
-                tasks_data = json.loads(json_text)
+        normalized_names = frozenset(unknown_names)
 
-                return [
-                    (task["name"], task["task_key"],
-                     TaskType(task["task_type"]))
-                    for task in tasks_data
-                ]
-            else:
-                tasks_data = json.loads(response_text)
-                return [
-                    (task["name"], task["task_key"],
-                     TaskType(task["task_type"]))
-                    for task in tasks_data
-                ]
+        # Defaults depend on the project, the mapping only on the task names
+        project_context = None if analysis.tasks_identified else (
+            analysis.room_type,
+            analysis.room_size,
+            analysis.location,
+            analysis.budget_preference,
+            tuple(sorted(analysis.special_requirements))
+        )
 
-        except Exception as e:
-            print(f"Error generating default tasks with OpenAI: {e}")
-            return [
-                ("Remove old tiles", "demolition", TaskType.DEMOLITION),
-                ("Plumbing work", "plumbing", TaskType.PLUMBING),
-                ("Install new tiles", "tiling", TaskType.TILING),
-                ("Paint walls", "painting", TaskType.PAINTING),
-                ("Install fixtures", "fixtures", TaskType.FIXTURES)
-            ]
+        return known_mappings, normalized_names, project_context
+
+    def _resolve_task_plan(self, task_names: List[str], known_mappings: Dict[str, Dict[str, str]],
+                           plan: Dict) -> Tuple[Dict[str, Dict[str, str]], List[tuple]]:
+        task_mappings = plan.get("mapping") or {}
+
+        if task_mappings or known_mappings:
+            result = dict(known_mappings)
+            for task_name in task_names:
+                mapping = task_mappings.get(task_name.lower().strip())
+                if mapping:
+                    result[task_name] = mapping
+            return result, []
+
+        default_tasks = [
+            (task["name"], task["task_key"],
+             _TASK_TYPE_BY_VALUE.get(task["task_type"], TaskType.FIXTURES))
+            for task in plan.get("defaults") or []
+        ]
+        return {}, default_tasks
+
+    def _default_tasks(self) -> List[tuple]:
+        return [
+            ("Remove old tiles", "demolition", TaskType.DEMOLITION),
+            ("Plumbing work", "plumbing", TaskType.PLUMBING),
+            ("Install new tiles", "tiling", TaskType.TILING),
+            ("Paint walls", "painting", TaskType.PAINTING),
+            ("Install fixtures", "fixtures", TaskType.FIXTURES)
+        ]
 
     def _fallback_task_mapping(self, task_names: List[str]) -> Dict[str, Dict[str, str]]:
-        fallback_mapping = {
-            "remove tiles": {"task_key": "demolition", "task_type": "demolition"},
-            "tile removal": {"task_key": "demolition", "task_type": "demolition"},
-            "demolition": {"task_key": "demolition", "task_type": "demolition"},
-            "plumbing": {"task_key": "plumbing", "task_type": "plumbing"},
-            "plumbing work": {"task_key": "plumbing", "task_type": "plumbing"},
-            "redo plumbing": {"task_key": "plumbing", "task_type": "plumbing"},
-            "electrical": {"task_key": "electrical", "task_type": "electrical"},
-            "electrical work": {"task_key": "electrical", "task_type": "electrical"},
-            "tiling": {"task_key": "tiling", "task_type": "tiling"},
-            "tile installation": {"task_key": "tiling", "task_type": "tiling"},
-            "lay tiles": {"task_key": "tiling", "task_type": "tiling"},
-            "painting": {"task_key": "painting", "task_type": "painting"},
-            "paint": {"task_key": "painting", "task_type": "painting"},
-            "repaint": {"task_key": "painting", "task_type": "painting"},
-            "flooring": {"task_key": "flooring", "task_type": "flooring"},
-            "install fixtures": {"task_key": "fixtures", "task_type": "fixtures"},
-            "fixture installation": {"task_key": "fixtures", "task_type": "fixtures"},
-            "install vanity": {"task_key": "fixtures", "task_type": "fixtures"},
-            "install toilet": {"task_key": "fixtures", "task_type": "fixtures"}
-        }
-
         result = {}
         for task_name in task_names:
-            mapping = fallback_mapping.get(task_name.lower())
-            if mapping:
-                result[task_name] = mapping
+            task_name_lower = task_name.lower()
+            match = _FALLBACK_TASK_RE.search(task_name_lower)
+            if match:
+                result[task_name] = _FALLBACK_TASK_MAPPING[match.group(1)]
             else:
                 # Default mapping for unknown tasks
                 result[task_name] = {
-                    "task_key": task_name.lower(), "task_type": "fixtures"}
+                    "task_key": task_name_lower, "task_type": "fixtures"}
 
         return result
 
     def _create_task(self, name: str, task_type: TaskType, task_key: str,
                      analysis: TranscriptAnalysis,
-                     project_context: Dict) -> Optional[Task]:
+                     project_context: Dict, complexity_code: int,
+                     labor: Labor) -> Optional[Task]:
         try:
-            complexity = self._determine_task_complexity(task_key, analysis)
-            labor = self.labor_calc.calculate_labor(
-                task_name=task_key,
-                area=analysis.room_size,
-                complexity=complexity,
-                urgency_factor=1.0
-            )
 
-            budget_level = self._map_budget_to_variant(
-                analysis.budget_preference)
+            budget_level = _BUDGET_VARIANTS[analysis.budget_code]
             materials = self.material_db.get_task_materials(
                 task_type=task_key,
                 area=analysis.room_size,
                 budget_level=budget_level
             )
 
-            material_total = sum(material.total for material in materials)
+            material_total = math.fsum([material.total for material in materials])
             subtotal = labor.total + material_total
 
             vat_rate, vat_amount = self.vat_calc.calculate_vat(
                 task_key, subtotal, project_context)
 
             margin = self._calculate_margin(
-                subtotal, complexity, analysis.budget_preference)
+                subtotal, complexity_code, analysis.budget_code)
             subtotal_with_margin = subtotal * (1 + margin)
             vat_amount_with_margin = vat_amount * (1 + margin)
             total_price = subtotal_with_margin + vat_amount_with_margin
@@ -325,12 +493,12 @@ Return only a JSON array.
             task_confidence = self._calculate_task_confidence(
                 task_key, materials, labor)
 
-            duration = self.labor_calc.estimate_project_duration(
-                [type('Task', (), {'labor': labor})()])
+            duration = self.labor_calc.estimate_hours_duration([labor.hours])
 
             vat_percentage = f"{vat_rate * 100:.1f}%"
 
-            return Task(
+            # Values are computed and clamped internally, skip re-validation
+            return Task.model_construct(
                 name=name,
                 task_type=task_type,
                 description=f"{name} for {analysis.room_size}sqm bathroom",
@@ -344,7 +512,7 @@ Return only a JSON array.
                 total_price=total_price,
                 margin=margin,
                 confidence_score=task_confidence,
-                complexity_factor=self._get_complexity_multiplier(complexity)
+                complexity_factor=_COMPLEXITY_MULTIPLIERS[complexity_code]
             )
 
         except Exception as e:
@@ -352,103 +520,43 @@ Return only a JSON array.
             return None
 
     def _determine_task_complexity(self, task_key: str, analysis: TranscriptAnalysis) -> str:
-        complexity_indicators = {
-            "simple": 0,
-            "moderate": 1,
-            "complex": 2
-        }
-
-        complexity_score = 1
-
-        if analysis.room_size > 6:
-            complexity_score += 1
-        elif analysis.room_size < 3:
-            complexity_score += 0.5
-
-        if analysis.budget_preference in ["premium", "luxury"]:
-            complexity_score += 1
-
-        if analysis.special_requirements:
-            complexity_score += 0.5
-
-        complex_tasks = ["plumbing", "electrical", "waterproofing"]
-        if task_key in complex_tasks:
-            complexity_score += 0.5
-
-        if complexity_score >= 2.5:
-            return "complex"
-        elif complexity_score >= 1.5:
-            return "moderate"
-        else:
-            return "simple"
+        return _COMPLEXITY_LEVELS[self._determine_complexity_code(task_key, analysis)]
+
+    def _determine_complexity_code(self, task_key: str, analysis: TranscriptAnalysis) -> int:
+        return fast.complexity_code(
+            analysis.room_size,
+            analysis.budget_code >= BUDGET_CODES["premium"],
+            bool(analysis.special_requirements),
+            task_key in _COMPLEX_TASKS
+        )
 
     def _map_budget_to_variant(self, budget_preference: str) -> str:
-        mapping = {
-            "budget-conscious": "basic",
-            "moderate": "basic",
-            "premium": "premium",
-            "luxury": "luxury"
-        }
-        return mapping.get(budget_preference, "basic")
-
-    def _calculate_margin(self, subtotal: float, complexity: str, budget_preference: str) -> float:
-        base_margin = 0.15
-
-        complexity_adjustments = {
-            "simple": 0.0,
-            "moderate": 0.02,
-            "complex": 0.05
-        }
+        return _BUDGET_VARIANTS[BUDGET_CODES.get(budget_preference, DEFAULT_BUDGET_CODE)]
 
-        budget_adjustments = {
-            "budget-conscious": -0.02,
-            "moderate": 0.0,
-            "premium": 0.05,
-            "luxury": 0.10
-        }
-
-        margin = base_margin
-        margin += complexity_adjustments.get(complexity, 0.02)
-        margin += budget_adjustments.get(budget_preference, 0.0)
-
-        return max(0.15, min(0.30, margin))
+    def _calculate_margin(self, subtotal: float, complexity_code: int, budget_code: int) -> float:
+        return fast.margin(
+            _COMPLEXITY_ADJUSTMENTS[complexity_code],
+            _BUDGET_ADJUSTMENTS[budget_code]
+        )
 
     def _get_complexity_multiplier(self, complexity: str) -> float:
-        multipliers = {
-            "simple": 1.0,
-            "moderate": 1.2,
-            "complex": 1.5
-        }
-        return multipliers.get(complexity, 1.2)
+        return _COMPLEXITY_MULTIPLIERS[_COMPLEXITY_CODES.get(complexity, _DEFAULT_COMPLEXITY_CODE)]
 
     def _calculate_task_confidence(self, task_key: str, materials: List, labor) -> float:
-        base_confidence = {
-            "painting": 0.9,
-            "demolition": 0.85,
-            "tiling": 0.8,
-            "fixtures": 0.75,
-            "plumbing": 0.7,
-            "electrical": 0.7,
-            "waterproofing": 0.65
-        }.get(task_key, 0.75)
+        base_confidence = _BASE_TASK_CONFIDENCE.get(task_key, 0.75)
 
         if materials:
-            avg_availability = sum(
-                m.availability_score for m in materials) / len(materials)
+            avg_availability = math.fsum(
+                [m.availability_score for m in materials]) / len(materials)
             material_factor = avg_availability
         else:
             material_factor = 0.8
 
-        labor_factor = 1.0 - (labor.hours - 4) * 0.02
-        labor_factor = max(0.5, labor_factor)
-
-        task_confidence = base_confidence * 0.5 + \
-            material_factor * 0.3 + labor_factor * 0.2
-
-        return max(0.0, min(1.0, task_confidence))
+        return fast.task_confidence(base_confidence, material_factor, labor.hours)
 
     def _prepare_confidence_data(self, analysis: TranscriptAnalysis,
-                                 tasks: List[Task], project_context: Dict) -> Dict:
+                                 materials_list: List[Tuple[float, float, float]],
+                                 project_context: Dict) -> Dict:
         return {
             "transcript_clarity": analysis.clarity_score,
             "room_dimensions": analysis.room_size > 0,
@@ -456,14 +564,7 @@ Return only a JSON array.
             "material_specificity": 0.7,
             "has_budget_info": analysis.budget_preference != "moderate",
             "has_timeline": False,
-            "materials_list": [
-                {
-                    "availability_score": material.availability_score,
-                    "price_stability": 0.8,
-                    "supplier_reliability": 0.85
-                }
-                for task in tasks for material in task.materials
-            ],
+            "materials_list": materials_list,
             "task_standardization_score": 0.8,
             "complexity_accuracy": 0.75,
             "has_local_labor_rates": True,
@@ -482,8 +583,8 @@ Return only a JSON array.
         return f"{analysis.room_size}sqm {analysis.room_type} renovation in {analysis.location}: {task_list}. Budget preference: {analysis.budget_preference}."
 
     def get_quote_summary(self, quote: Quote) -> Dict[str, any]:
-        risk_assessment = self.confidence_scorer.assess_quote_risk(
-            quote.dict())
+        risk_assessment = self.confidence_scorer.assess_risk(
+            quote.global_confidence_score, quote.grand_total)
 
         return {
             "quote_id": quote.quote_id,
@@ -0,0 +1,71 @@
+"""Scalar pricing kernels, optionally compiled with Numba.
+
+Set DONIZO_JIT=1 (and install the ``jit`` extra) to compile these with
+``numba.njit``. Without it they run as plain Python and numba is never imported.
+"""
+import os
+
+
+JIT_ENABLED = os.getenv("DONIZO_JIT", "").lower() in ("1", "true", "yes")
+
+
+def maybe_jit(func):
+    if not JIT_ENABLED:
+        return func
+
+    try:
+        from numba import njit
+    except ImportError:
+        return func
+
+    return njit(cache=True)(func)
+
+
+@maybe_jit
+def complexity_code(room_size: float, premium_budget: bool,
+                    has_special_requirements: bool, complex_task: bool) -> int:
+    complexity_score = 1.0
+
+    if room_size > 6:
+        complexity_score += 1.0
+    elif room_size < 3:
+        complexity_score += 0.5
+
+    if premium_budget:
+        complexity_score += 1.0
+
+    if has_special_requirements:
+        complexity_score += 0.5
+
+    if complex_task:
+        complexity_score += 0.5
+
+    if complexity_score >= 2.5:
+        return 2
+    elif complexity_score >= 1.5:
+        return 1
+    else:
+        return 0
+
+
+@maybe_jit
+def margin(complexity_adjustment: float, budget_adjustment: float) -> float:
+    value = 0.15 + complexity_adjustment + budget_adjustment
+    return max(0.15, min(0.30, value))
+
+
+@maybe_jit
+def task_confidence(base_confidence: float, material_factor: float,
+                    labor_hours: float) -> float:
+    labor_factor = max(0.5, 1.0 - (labor_hours - 4) * 0.02)
+
+    confidence = base_confidence * 0.5 + \
+        material_factor * 0.3 + labor_factor * 0.2
+
+    return max(0.0, min(1.0, confidence))
+
+
+def warm_up() -> None:
+    complexity_code(4.0, False, False, False)
+    margin(0.02, 0.0)
+    task_confidence(0.75, 0.8, 4.0)
@@ -1,6 +1,6 @@
 from typing import Dict, List, Optional
-from pydantic import BaseModel, Field
-from enum import Enum
+from pydantic import BaseModel, ConfigDict, Field
+from enum import Enum, IntFlag
 from datetime import datetime
 import uuid
 
@@ -26,6 +26,11 @@ class MaterialCategory(str, Enum):
     CONSUMABLES = "consumables"
 
 
+BUDGET_LEVELS = ("budget-conscious", "moderate", "premium", "luxury")
+BUDGET_CODES = {level: code for code, level in enumerate(BUDGET_LEVELS)}
+DEFAULT_BUDGET_CODE = BUDGET_CODES["moderate"]
+
+
 class VATRate(str, Enum):
     STANDARD = "standard"  # 20%
     REDUCED = "reduced"    # 10%
@@ -33,6 +38,9 @@ class VATRate(str, Enum):
 
 
 class Material(BaseModel):
+    # Priced materials are cached and shared between quotes
+    model_config = ConfigDict(frozen=True)
+
     name: str
     category: MaterialCategory
     quantity: float
@@ -77,7 +85,7 @@ class Zone(BaseModel):
 
 
 class Quote(BaseModel):
-    quote_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    quote_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     created_at: datetime = Field(default_factory=datetime.now)
     client_location: str
     project_summary: str
@@ -88,6 +96,23 @@ class Quote(BaseModel):
     grand_total: float
 
 
+class Completeness(IntFlag):
+    LOCATION = 1
+    DIMENSIONS = 2
+    TASKS = 4
+    BUDGET = 8
+    SPECIAL_REQUIREMENTS = 16
+
+    def as_dict(self) -> Dict[str, bool]:
+        return {
+            "has_location": bool(self & Completeness.LOCATION),
+            "has_dimensions": bool(self & Completeness.DIMENSIONS),
+            "has_tasks": bool(self & Completeness.TASKS),
+            "has_budget_info": bool(self & Completeness.BUDGET),
+            "has_special_requirements": bool(self & Completeness.SPECIAL_REQUIREMENTS)
+        }
+
+
 class TranscriptAnalysis(BaseModel):
     location: str
     room_type: str
@@ -98,6 +123,11 @@ class TranscriptAnalysis(BaseModel):
     clarity_score: float = Field(ge=0.0, le=1.0)
     raw_transcript: str
 
+    @property
+    def budget_code(self) -> int:
+        # Index into BUDGET_LEVELS
+        return BUDGET_CODES.get(self.budget_preference, DEFAULT_BUDGET_CODE)
+
 
 class FeedbackData(BaseModel):
     quote_id: str
@@ -1,11 +1,34 @@
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 load_dotenv()
 
+# Bound hung calls and transient failures instead of the SDK's 10 minute default
+_TIMEOUT = 20.0
+_MAX_RETRIES = 3
+
+
+def create_async_client() -> AsyncOpenAI:
+    return AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        timeout=_TIMEOUT,
+        max_retries=_MAX_RETRIES
+    )
+
+
+# Process-wide clients: every analyzer, calculator and engine call goes through
+# these two so requests reuse the SDK's pooled keep-alive connections. Import
+# them rather than constructing new clients. The async pool is tied to the
+# event loop that first uses it, so async entry points that may each run under
+# their own asyncio.run loop open a client from create_async_client() for the
+# call and pass it down instead.
 openai_client = OpenAI(
-    api_key=os.getenv("OPENAI_API_KEY")
+    api_key=os.getenv("OPENAI_API_KEY"),
+    timeout=_TIMEOUT,
+    max_retries=_MAX_RETRIES
 )
 
+async_openai_client = create_async_client()
+
 DEFAULT_MODEL = "gpt-4o-mini"
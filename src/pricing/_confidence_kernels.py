@@ -0,0 +1,55 @@
+"""Arithmetic cores of the confidence scorer, compiled when DONIZO_JIT is set."""
+from typing import Tuple
+
+from src.fast import JIT_ENABLED, maybe_jit
+
+
+@maybe_jit
+def input_clarity(base_score: float, has_dimensions: bool, has_budget: bool,
+                  has_timeline: bool, task_clarity: float) -> float:
+    completeness_bonus = ((0.1 if has_dimensions else 0.0) +
+                          (0.1 if has_budget else 0.0) +
+                          (0.05 if has_timeline else 0.0))
+
+    clarity_adjustment = (task_clarity - 0.5) * 0.2
+
+    return min(1.0, base_score + completeness_bonus + clarity_adjustment)
+
+
+@maybe_jit
+def labor_accuracy(standardization: float, complexity_accuracy: float,
+                   has_local_rates: bool, skill_clarity: float) -> float:
+    complexity_adj = (complexity_accuracy - 0.5) * 0.2
+    local_bonus = 0.1 if has_local_rates else -0.1
+    skill_adj = (skill_clarity - 0.5) * 0.1
+
+    return max(0.0, min(1.0, standardization + complexity_adj + local_bonus + skill_adj))
+
+
+@maybe_jit
+def overall_score(input_clarity: float, material_availability: float,
+                  labor_accuracy: float, risk_adjustment: float,
+                  input_weight: float, material_weight: float,
+                  labor_weight: float) -> float:
+    weighted_score = (input_clarity * input_weight +
+                      material_availability * material_weight +
+                      labor_accuracy * labor_weight)
+
+    return max(0.0, min(1.0, weighted_score + risk_adjustment))
+
+
+@maybe_jit
+def potential_variance(confidence_score: float, project_value: float) -> Tuple[float, float]:
+    variance_factor = 1 - confidence_score
+
+    potential_overrun = project_value * variance_factor * 0.3  # Max 30% overrun
+    potential_saving = project_value * variance_factor * 0.1   # Max 10% saving
+
+    return potential_overrun, potential_saving
+
+
+if JIT_ENABLED:
+    input_clarity(0.7, False, False, False, 0.5)
+    labor_accuracy(0.8, 0.7, True, 0.8)
+    overall_score(0.8, 0.5, 0.8, 0.0, 0.4, 0.3, 0.3)
+    potential_variance(0.75, 1000.0)
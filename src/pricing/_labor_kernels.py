@@ -0,0 +1,31 @@
+"""Arithmetic core of the labor calculator, compiled when DONIZO_JIT is set."""
+from src.fast import JIT_ENABLED, maybe_jit
+
+
+# Variable-hours unit codes used in the flat estimate table
+UNIT_M2 = 0
+UNIT_FIXTURE = 1
+UNIT_POINT = 2
+UNIT_FIXED = 3
+
+
+@maybe_jit
+def labor_hours(base_hours: float, variable_unit: int, variable_rate: float,
+                complexity_multiplier: float, area: float) -> float:
+    if variable_unit == UNIT_M2:
+        variable_hours = variable_rate * area
+    elif variable_unit == UNIT_FIXTURE:
+        fixtures = max(1, int(area / 2))  # Rough estimate
+        variable_hours = variable_rate * fixtures
+    elif variable_unit == UNIT_POINT:
+        points = max(2, int(area))  # Minimum 2 points
+        variable_hours = variable_rate * points
+    else:
+        # Fixed time tasks
+        variable_hours = 0.0
+
+    return (base_hours + variable_hours) * complexity_multiplier
+
+
+if JIT_ENABLED:
+    labor_hours(4.0, UNIT_M2, 0.8, 1.3, 4.0)
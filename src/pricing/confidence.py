@@ -1,6 +1,44 @@
 from typing import Dict, List, Tuple
+import sys
+from bisect import bisect_right
+from itertools import chain
 import math
 
+from src.pricing import _confidence_kernels as kernels
+
+
+# Score cut-offs shared by the confidence level and risk grids; bisect_right
+# maps a score to an index into the parallel label tuples below
+_CONFIDENCE_CUTS = (0.6, 0.7, 0.8, 0.9)
+_CONFIDENCE_LEVELS = ("Very Low", "Low", "Medium", "High", "Very High")
+_RISK_LEVELS = ("Very High", "High", "Medium", "Low", "Very Low")
+_RISK_COLORS = ("red", "orange", "yellow", "lightgreen", "green")
+_RISK_ACTIONS = (
+    "Do not quote without additional information",
+    "Detailed review required, consider site visit",
+    "Review and add 5-10% contingency",
+    "Proceed with minor review",
+    "Proceed with quote as-is"
+)
+_CONTINGENCIES = (
+    "20%+ contingency required or decline quote",
+    "15-20% contingency recommended",
+    "10-15% contingency recommended",
+    "5-10% contingency recommended",
+    "0-5% contingency recommended"
+)
+
+_REC_SITE_VISIT = sys.intern("Recommend site visit before finalizing quote")
+_REC_MORE_DETAILS = sys.intern("Request additional project details from client")
+_REC_CONTINGENCY = sys.intern("Consider adding contingency margin")
+_REC_VERIFY_SPECS = sys.intern("Verify material specifications with client")
+_REC_MINOR_CLARIFICATIONS = sys.intern("Quote ready with minor clarifications")
+_REC_CLEARER_SPECS = sys.intern("Request clearer project specifications")
+_REC_VERIFY_PRICES = sys.intern("Verify current material prices and availability")
+_REC_SECOND_OPINION = sys.intern("Consider getting second opinion on labor estimates")
+_REC_PREMIUM_MARKET = sys.intern("Premium market - ensure quality standards alignment")
+_PREMIUM_MARKETS = frozenset(("paris", "nice", "cannes"))
+
 
 class ConfidenceScorer:
     def __init__(self):
@@ -9,15 +47,28 @@ class ConfidenceScorer:
             "material_availability": 0.30,
             "labor_accuracy": 0.30
         }
+        self._score_keys = (
+            "input_clarity", "material_availability", "labor_accuracy")
+        self._weight_vec = tuple(
+            self.scoring_weights[key] for key in self._score_keys)
+
+        # Assessment keys/defaults in kernel argument order
+        self._clarity_keys = ("transcript_clarity", "room_dimensions",
+                              "has_budget_info", "has_timeline", "task_clarity_score")
+        self._clarity_defaults = (0.7, False, False, False, 0.5)
+        self._labor_keys = ("task_standardization_score", "complexity_accuracy",
+                            "has_local_labor_rates", "skill_requirements_clarity")
+        self._labor_defaults = (0.8, 0.7, True, 0.8)
 
         self.risk_factors = self._initialize_risk_factors()
-        self.confidence_thresholds = {
-            "very_high": 0.9,
-            "high": 0.8,
-            "medium": 0.7,
-            "low": 0.6,
-            "very_low": 0.0
+        # Risk names are unique across categories, so one flat table suffices
+        self._flat_risk = {
+            risk: adjustment
+            for category_factors in self.risk_factors.values()
+            for risk, adjustment in category_factors.items()
         }
+        self._risk_data_keys = tuple(
+            f"{risk_category}_detected" for risk_category in self.risk_factors)
 
     def _initialize_risk_factors(self) -> Dict[str, Dict]:
         return {
@@ -51,187 +102,172 @@ class ConfidenceScorer:
         }
 
     def calculate_confidence(self, assessment_data: Dict) -> Tuple[float, Dict]:
-        scores = {}
-
-        scores["input_clarity"] = self._score_input_clarity(assessment_data)
-
-        scores["material_availability"] = self._score_material_availability(
+        input_clarity = self._score_input_clarity(assessment_data)
+        material_availability = self._score_material_availability(
             assessment_data)
+        labor_accuracy = self._score_labor_accuracy(assessment_data)
 
-        scores["labor_accuracy"] = self._score_labor_accuracy(assessment_data)
-
-        overall_score = sum(
-            scores[factor] * weight
-            for factor, weight in self.scoring_weights.items()
-        )
+        scores = dict(zip(self._score_keys, (
+            input_clarity, material_availability, labor_accuracy)))
 
         risk_adjustment = self._calculate_risk_adjustment(assessment_data)
-        overall_score = max(0.0, min(1.0, overall_score + risk_adjustment))
+        overall_score = kernels.overall_score(
+            input_clarity, material_availability, labor_accuracy,
+            risk_adjustment, *self._weight_vec)
 
+        # Raw floats; serialize_breakdown rounds them for reporting
         breakdown = {
-            "overall_score": round(overall_score, 3),
-            "component_scores": {k: round(v, 3) for k, v in scores.items()},
-            "risk_adjustment": round(risk_adjustment, 3),
+            "overall_score": overall_score,
+            "component_scores": scores,
+            "risk_adjustment": risk_adjustment,
             "confidence_level": self._get_confidence_level(overall_score),
             "recommendations": self._get_recommendations(overall_score, scores, assessment_data)
         }
 
         return overall_score, breakdown
 
-    def _score_input_clarity(self, data: Dict) -> float:
-        clarity_factors = {
-            "has_dimensions": data.get("room_dimensions", False),
-            "clear_task_description": data.get("task_clarity_score", 0.5),
-            "specific_materials": data.get("material_specificity", 0.5),
-            "budget_indication": data.get("has_budget_info", False),
-            "timeline_specified": data.get("has_timeline", False)
+    def serialize_breakdown(self, breakdown: Dict) -> Dict:
+        return {
+            **breakdown,
+            "overall_score": round(breakdown["overall_score"], 3),
+            "component_scores": {
+                k: round(v, 3) for k, v in breakdown["component_scores"].items()},
+            "risk_adjustment": round(breakdown["risk_adjustment"], 3)
         }
 
-        base_score = data.get("transcript_clarity", 0.7)
+    def calculate_confidence_batch(self, assessments: List[Dict]) -> List[float]:
+        input_clarity = [
+            kernels.input_clarity(float(base), bool(dims), bool(budget),
+                                  bool(timeline), float(task))
+            for base, dims, budget, timeline, task in zip(*self._gather_columns(
+                assessments, self._clarity_keys, self._clarity_defaults))
+        ]
+
+        material_availability = [
+            self._score_material_availability(data) for data in assessments]
+
+        labor_accuracy = [
+            kernels.labor_accuracy(float(standard), float(complexity),
+                                   bool(local), float(skill))
+            for standard, complexity, local, skill in zip(*self._gather_columns(
+                assessments, self._labor_keys, self._labor_defaults))
+        ]
+
+        risk_adjustments = [
+            self._calculate_risk_adjustment(data) for data in assessments]
+
+        overall_score = kernels.overall_score
+        weight_vec = self._weight_vec
+        return [
+            overall_score(clarity, material, labor, risk, *weight_vec)
+            for clarity, material, labor, risk in zip(
+                input_clarity, material_availability, labor_accuracy, risk_adjustments)
+        ]
+
+    def _gather_columns(self, assessments: List[Dict], keys: Tuple[str, ...],
+                        defaults: Tuple) -> List[List]:
+        return [
+            [data.get(key, default) for data in assessments]
+            for key, default in zip(keys, defaults)
+        ]
 
-        completeness_bonus = sum([
-            0.1 if clarity_factors["has_dimensions"] else 0,
-            0.1 if clarity_factors["budget_indication"] else 0,
-            0.05 if clarity_factors["timeline_specified"] else 0
-        ])
-
-        clarity_adjustment = (
-            clarity_factors["clear_task_description"] - 0.5) * 0.2
-
-        return min(1.0, base_score + completeness_bonus + clarity_adjustment)
+    def _score_input_clarity(self, data: Dict) -> float:
+        base_score, has_dimensions, has_budget, has_timeline, task_clarity = [
+            data.get(key, default)
+            for key, default in zip(self._clarity_keys, self._clarity_defaults)
+        ]
+        return kernels.input_clarity(
+            float(base_score), bool(has_dimensions), bool(has_budget),
+            bool(has_timeline), float(task_clarity))
 
     def _score_material_availability(self, data: Dict) -> float:
-        materials = data.get("materials_list", [])
+        materials = data.get("materials_list")
 
         if not materials:
             return 0.5  # Neutral if no specific materials
 
-        availability_scores = []
+        # Each entry is (availability_score, price_stability, supplier_reliability);
+        # the mean of the weighted scores equals the weighted column means
+        availability, price_stability, supplier_reliability = zip(*materials)
 
-        for material in materials:
-            availability = material.get("availability_score", 0.9)
-            price_stability = material.get("price_stability", 0.8)
-            supplier_reliability = material.get("supplier_reliability", 0.85)
+        weighted_total = (math.fsum(availability) * 0.5 +
+                          math.fsum(price_stability) * 0.3 +
+                          math.fsum(supplier_reliability) * 0.2)
 
-            material_score = (
-                availability * 0.5 + price_stability * 0.3 + supplier_reliability * 0.2)
-            availability_scores.append(material_score)
-
-        return sum(availability_scores) / len(availability_scores)
+        return weighted_total / len(materials)
 
     def _score_labor_accuracy(self, data: Dict) -> float:
-        factors = {
-            "task_standardization": data.get("task_standardization_score", 0.8),
-            "complexity_assessment": data.get("complexity_accuracy", 0.7),
-            "local_labor_data": data.get("has_local_labor_rates", True),
-            "skill_requirements_clear": data.get("skill_requirements_clarity", 0.8)
-        }
-
-        base_score = factors["task_standardization"]
-
-        complexity_adj = (factors["complexity_assessment"] - 0.5) * 0.2
-
-        local_bonus = 0.1 if factors["local_labor_data"] else -0.1
-
-        skill_adj = (factors["skill_requirements_clear"] - 0.5) * 0.1
-
-        return max(0.0, min(1.0, base_score + complexity_adj + local_bonus + skill_adj))
+        standardization, complexity_accuracy, has_local_rates, skill_clarity = [
+            data.get(key, default)
+            for key, default in zip(self._labor_keys, self._labor_defaults)
+        ]
+        return kernels.labor_accuracy(
+            float(standardization), float(complexity_accuracy),
+            bool(has_local_rates), float(skill_clarity))
 
     def _calculate_risk_adjustment(self, data: Dict) -> float:
-        total_adjustment = 0.0
-
-        for risk_category, risk_factors in self.risk_factors.items():
-            category_risks = data.get(f"{risk_category}_detected", [])
-
-            for risk in category_risks:
-                if risk in risk_factors:
-                    total_adjustment += risk_factors[risk]
+        flat_risk = self._flat_risk
+        detected_risks = chain.from_iterable(
+            data.get(data_key) or () for data_key in self._risk_data_keys
+        )
 
-        return total_adjustment
+        return sum((flat_risk.get(risk, 0.0) for risk in detected_risks), 0.0)
 
     def _get_confidence_level(self, score: float) -> str:
-        if score >= self.confidence_thresholds["very_high"]:
-            return "Very High"
-        elif score >= self.confidence_thresholds["high"]:
-            return "High"
-        elif score >= self.confidence_thresholds["medium"]:
-            return "Medium"
-        elif score >= self.confidence_thresholds["low"]:
-            return "Low"
-        else:
-            return "Very Low"
+        return _CONFIDENCE_LEVELS[bisect_right(_CONFIDENCE_CUTS, score)]
 
     def _get_recommendations(self, score: float, component_scores: Dict, data: Dict) -> List[str]:
         recommendations = []
 
         if score < 0.6:
-            recommendations.append(
-                "Recommend site visit before finalizing quote")
-            recommendations.append(
-                "Request additional project details from client")
+            recommendations.append(_REC_SITE_VISIT)
+            recommendations.append(_REC_MORE_DETAILS)
         elif score < 0.7:
-            recommendations.append("Consider adding contingency margin")
-            recommendations.append(
-                "Verify material specifications with client")
+            recommendations.append(_REC_CONTINGENCY)
+            recommendations.append(_REC_VERIFY_SPECS)
         elif score < 0.8:
-            recommendations.append("Quote ready with minor clarifications")
+            recommendations.append(_REC_MINOR_CLARIFICATIONS)
 
         if component_scores.get("input_clarity", 0) < 0.7:
-            recommendations.append("Request clearer project specifications")
+            recommendations.append(_REC_CLEARER_SPECS)
 
         if component_scores.get("material_availability", 0) < 0.8:
-            recommendations.append(
-                "Verify current material prices and availability")
+            recommendations.append(_REC_VERIFY_PRICES)
 
         if component_scores.get("labor_accuracy", 0) < 0.75:
-            recommendations.append(
-                "Consider getting second opinion on labor estimates")
+            recommendations.append(_REC_SECOND_OPINION)
 
         location = data.get("location", "").lower()
-        if location in ["paris", "nice", "cannes"]:
+        if location in _PREMIUM_MARKETS:
             if score < 0.8:
-                recommendations.append(
-                    "Premium market - ensure quality standards alignment")
+                recommendations.append(_REC_PREMIUM_MARKET)
 
-        return list(set(recommendations))
+        return list(dict.fromkeys(recommendations))
 
     def assess_quote_risk(self, quote_data: Dict) -> Dict[str, any]:
-        confidence_score = quote_data.get("global_confidence_score", 0.5)
-        project_value = quote_data.get("grand_total", 0)
-
-        if confidence_score >= 0.9:
-            risk_level = "Very Low"
-            risk_color = "green"
-        elif confidence_score >= 0.8:
-            risk_level = "Low"
-            risk_color = "lightgreen"
-        elif confidence_score >= 0.7:
-            risk_level = "Medium"
-            risk_color = "yellow"
-        elif confidence_score >= 0.6:
-            risk_level = "High"
-            risk_color = "orange"
-        else:
-            risk_level = "Very High"
-            risk_color = "red"
+        return self.assess_risk(
+            quote_data.get("global_confidence_score", 0.5),
+            quote_data.get("grand_total", 0)
+        )
+
+    def assess_risk(self, confidence_score: float, project_value: float) -> Dict[str, any]:
+        risk_index = bisect_right(_CONFIDENCE_CUTS, confidence_score)
 
         potential_variance = self._calculate_potential_variance(
             confidence_score, project_value)
 
         return {
-            "risk_level": risk_level,
-            "risk_color": risk_color,
+            "risk_level": _RISK_LEVELS[risk_index],
+            "risk_color": _RISK_COLORS[risk_index],
             "confidence_score": confidence_score,
             "potential_variance": potential_variance,
-            "recommended_action": self._get_risk_action(risk_level),
-            "contingency_suggestion": self._suggest_contingency(confidence_score)
+            "recommended_action": _RISK_ACTIONS[risk_index],
+            "contingency_suggestion": _CONTINGENCIES[risk_index]
         }
 
     def _calculate_potential_variance(self, confidence_score: float, project_value: float) -> Dict[str, float]:
-        variance_factor = 1 - confidence_score
-
-        potential_overrun = project_value * variance_factor * 0.3  # Max 30% overrun
-        potential_saving = project_value * variance_factor * 0.1   # Max 10% saving
+        potential_overrun, potential_saving = kernels.potential_variance(
+            float(confidence_score), float(project_value))
 
         return {
             "potential_overrun": potential_overrun,
@@ -239,24 +275,23 @@ class ConfidenceScorer:
             "variance_range": f"-{potential_saving:.0f}€ to +{potential_overrun:.0f}€"
         }
 
+    def variance_batch(self, confidence_scores: List[float],
+                       project_values: List[float]) -> Tuple[List[float], List[float]]:
+        potential_variance = kernels.potential_variance
+        variances = [
+            potential_variance(float(confidence_score), float(project_value))
+            for confidence_score, project_value in zip(confidence_scores, project_values)
+        ]
+        if not variances:
+            return [], []
+
+        overruns, savings = zip(*variances)
+        return list(overruns), list(savings)
+
     def _get_risk_action(self, risk_level: str) -> str:
-        actions = {
-            "Very Low": "Proceed with quote as-is",
-            "Low": "Proceed with minor review",
-            "Medium": "Review and add 5-10% contingency",
-            "High": "Detailed review required, consider site visit",
-            "Very High": "Do not quote without additional information"
-        }
-        return actions.get(risk_level, "Review required")
+        if risk_level in _RISK_LEVELS:
+            return _RISK_ACTIONS[_RISK_LEVELS.index(risk_level)]
+        return "Review required"
 
     def _suggest_contingency(self, confidence_score: float) -> str:
-        if confidence_score >= 0.9:
-            return "0-5% contingency recommended"
-        elif confidence_score >= 0.8:
-            return "5-10% contingency recommended"
-        elif confidence_score >= 0.7:
-            return "10-15% contingency recommended"
-        elif confidence_score >= 0.6:
-            return "15-20% contingency recommended"
-        else:
-            return "20%+ contingency required or decline quote"
+        return _CONTINGENCIES[bisect_right(_CONFIDENCE_CUTS, confidence_score)]
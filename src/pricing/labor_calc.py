@@ -1,21 +1,188 @@
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from bisect import bisect_left
+from difflib import get_close_matches
+import re
+import sys
 import json
+import math
+from string import Template
 from src.models import Labor, TaskType
-from src.openai_client import openai_client, DEFAULT_MODEL
+from openai import AsyncOpenAI
+from src.openai_client import openai_client, async_openai_client, DEFAULT_MODEL
+from src.cache import DiskCache, cache_key
+from src.pricing import _labor_kernels as kernels
+
+
+_TASK_NAME_MAP = {
+    "remove tiles": "tile_removal",
+    "tile removal": "tile_removal",
+    "remove old tiles": "tile_removal",
+    "demolition": "demolition",
+    "demo": "demolition",
+    "plumbing work": "plumbing",
+    "plumber": "plumbing",
+    "redo plumbing": "plumbing",
+    "electrical work": "electrical",
+    "electrician": "electrical",
+    "rewiring": "electrical",
+    "tiling": "tiling",
+    "tile installation": "tiling",
+    "lay tiles": "tiling",
+    "painting": "painting",
+    "paint": "painting",
+    "repaint": "painting",
+    "flooring": "flooring",
+    "floor installation": "flooring",
+    "lay flooring": "flooring",
+    "waterproofing": "waterproofing",
+    "waterproof": "waterproofing",
+    "install fixtures": "fixture_installation",
+    "fixture installation": "fixture_installation",
+    "install vanity": "fixture_installation",
+    "install toilet": "fixture_installation"
+}
+
+# Longest synonyms first so e.g. "tile removal" wins over a shorter overlap
+_TASK_NAME_RE = re.compile(r"\b(" + "|".join(
+    re.escape(name) for name in sorted(_TASK_NAME_MAP, key=len, reverse=True)
+) + r")\b")
+
+_SKILL_MULTIPLIERS = {
+    "unskilled": 0.7,
+    "semi-skilled": 1.0,
+    "skilled": 1.3,
+    "specialist": 1.6
+}
+
+_RUSH_MULTIPLIERS = {
+    "standard": 1.0,
+    "urgent": 1.25,      # 25% surcharge
+    "emergency": 1.5     # 50% surcharge
+}
+
+_VARIABLE_UNITS = (
+    ("m2", kernels.UNIT_M2),
+    ("fixture", kernels.UNIT_FIXTURE),
+    ("point", kernels.UNIT_POINT)
+)
+
+# Labor is a pydantic model nested in Task, so bind the validation-free
+# constructor once instead of looking it up per estimate
+_construct_labor = Labor.model_construct
+
+# Upper bounds (inclusive, in working days) of each duration label
+_DURATION_BUCKETS = (1, 2, 5, 10)
+_DURATION_LABELS = (
+    lambda days: "1 day",
+    lambda days: "1-2 days",
+    lambda days: f"{int(days)}-{int(days)+1} days",
+    lambda days: "1-2 weeks",
+    lambda days: f"{int(days/5)}-{int(days/5)+1} weeks"
+)
+
+
+@lru_cache(maxsize=256)
+def _normalize_fallback(task_name: str) -> str:
+    match = _TASK_NAME_RE.search(task_name)
+    return _TASK_NAME_MAP[match.group(1)] if match else task_name
+
+
+_SINGLE_TASK_PROMPT = Template("""
+You are a construction task classifier. Given a task description, map it to the most appropriate standard task category.
+
+Available standard task categories:
+$available_tasks
+
+Task to classify: "$task_name"
+
+Instructions:
+- Return only the exact matching category name from the available list
+- If the task clearly matches a category, return that category
+- If no clear match exists, return "unknown"
+- Consider synonyms and common variations (e.g., "demo" -> "demolition", "paint job" -> "painting")
+
+Response format: a JSON object of the form {"category": "<category>"}
+""")
+
+_BULK_TASK_PROMPT = Template("""
+You are a construction task classifier. Map each task description to the most appropriate standard task category.
+
+Available standard task categories:
+$available_tasks
+
+Tasks to classify:
+$task_names
+
+Instructions:
+- Map every task exactly as written to a category name from the available list
+- If no clear match exists, map the task to its original text in lowercase
+- Consider synonyms and common variations (e.g., "demo" -> "demolition", "paint job" -> "painting")
+
+Response format: a JSON object of the form {"mapping": {"<task>": "<category>"}}
+""")
+
+# OpenAI task classifications, kept across runs
+_task_name_cache = DiskCache("task_names")
+
+# Spelled-out task keys plus every synonym, for typo-tolerant local matching
+_FUZZY_TASK_CHOICES = {
+    **{task_key.replace("_", " "): task_key for task_key in _TASK_NAME_MAP.values()},
+    **_TASK_NAME_MAP
+}
+_TASK_VOCABULARY = tuple(sorted(
+    {token for phrase in _FUZZY_TASK_CHOICES for token in phrase.split()}))
+_TASK_TOKEN_SPLIT_RE = re.compile(r"[\s_]+")
+
+
+@lru_cache(maxsize=1024)
+def _correct_task_token(token: str) -> str:
+    if token in _TASK_VOCABULARY:
+        return token
+
+    matches = get_close_matches(token, _TASK_VOCABULARY, n=1, cutoff=0.85)
+    return matches[0] if matches else token
+
+
+@lru_cache(maxsize=256)
+def _fuzzy_task_key(task_name: str) -> Optional[str]:
+    # Fix per-word typos only; the corrected phrase must then be a known key or
+    # synonym, so near misses like "remove toilet" are left for OpenAI
+    corrected = " ".join(
+        _correct_task_token(token)
+        for token in _TASK_TOKEN_SPLIT_RE.split(task_name.strip()) if token)
+    return _FUZZY_TASK_CHOICES.get(corrected)
 
 
 class LaborCalculator:
     def __init__(self):
         self.base_rates = self._initialize_rates()
         self.task_estimates = self._initialize_task_estimates()
-        self.skill_multipliers = {
-            "unskilled": 0.7,
-            "semi-skilled": 1.0,
-            "skilled": 1.3,
-            "specialist": 1.6
-        }
+        self.skill_multipliers = _SKILL_MULTIPLIERS
         # Cache for OpenAI task name mappings to avoid repeated API calls
         self._task_mapping_cache = {}
+        self._task_keys = tuple(self.task_estimates)
+        # The category list never changes, so fill it into the prompts once
+        self._single_task_prompt = Template(_SINGLE_TASK_PROMPT.safe_substitute(
+            available_tasks=", ".join(self._task_keys)))
+        self._bulk_task_prompt = Template(_BULK_TASK_PROMPT.safe_substitute(
+            available_tasks=", ".join(self._task_keys)))
+        self._category_response_format = {
+            "type": "json_schema",
+            "json_schema": {
+                "name": "task_category",
+                "strict": True,
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "category": {"type": "string", "enum": [*self._task_keys, "unknown"]}
+                    },
+                    "required": ["category"],
+                    "additionalProperties": False
+                }
+            }
+        }
+        self._flat_estimates = self._flatten_task_estimates()
 
     def _initialize_rates(self) -> Dict[str, float]:
         return {
@@ -128,80 +295,248 @@ class LaborCalculator:
             }
         }
 
+    def _flatten_task_estimates(self) -> Dict[Tuple[str, str], Tuple]:
+        # (task, complexity) -> (base_hours, variable_unit, variable_rate,
+        # complexity_multiplier, base_rate, skill_level, workers_needed);
+        # complexity None holds the 1.3 default for unknown complexities
+        flat = {}
+        for task_key, task_data in self.task_estimates.items():
+            variable_unit, variable_rate = kernels.UNIT_FIXED, 0.0
+            for unit, unit_code in _VARIABLE_UNITS:
+                if f"hours_per_{unit}" in task_data:
+                    variable_unit = unit_code
+                    variable_rate = task_data[f"hours_per_{unit}"]
+                    break
+
+            skill_level = sys.intern(task_data["skill_level"])
+            complexity_factors = dict(task_data["complexity_factors"])
+            complexity_factors[None] = 1.3
+            for complexity, multiplier in complexity_factors.items():
+                flat[task_key, complexity] = (
+                    task_data["base_hours"], variable_unit, variable_rate,
+                    multiplier, self.base_rates[skill_level], skill_level,
+                    task_data["workers_needed"]
+                )
+        return flat
+
     def calculate_labor(self, task_name: str, area: float = 4.0,
                         complexity: str = "moderate",
                         urgency_factor: float = 1.0) -> Labor:
 
-        task_key = self._normalize_task_name(task_name)
+        return self.calculate_labor_batch(
+            [task_name], [area], [complexity], [urgency_factor])[0]
+
+    def calculate_labor_batch(self, task_names: List[str], areas: List[float],
+                              complexities: List[str],
+                              urgency_factors: List[float]) -> List[Labor]:
+        flat_estimates = self._flat_estimates
+        task_keys = self.normalize_task_names(task_names)
+        labors = []
+
+        for task_name, area, complexity, urgency_factor in zip(
+                task_names, areas, complexities, urgency_factors):
+            task_key = task_keys[task_name]
+            estimate = flat_estimates.get((task_key, complexity)) or \
+                flat_estimates.get((task_key, None))
+            if estimate is None:
+                labors.append(self._default_labor_estimate(task_name, area))
+                continue
+
+            (base_hours, variable_unit, variable_rate, complexity_multiplier,
+             base_rate, skill_level, workers_needed) = estimate
+
+            hours = self._calculate_hours(
+                base_hours, variable_unit, variable_rate, complexity_multiplier, area)
+            adjusted_rate = base_rate * urgency_factor
+
+            labors.append(_construct_labor(
+                hours=hours,
+                rate=adjusted_rate,
+                total=hours * adjusted_rate,
+                skill_level=skill_level,
+                workers_needed=workers_needed
+            ))
+
+        return labors
+
+    def normalize_task_names(self, task_names: List[str]) -> Dict[str, str]:
+        result, pending = self._resolve_task_names_locally(task_names)
+
+        if pending:
+            # Everything the local tables can't place goes out in one request
+            try:
+                response = openai_client.chat.completions.create(
+                    **self._classify_request(list(pending)))
+                classified = self._parse_classification(
+                    response.choices[0].message.content, list(pending))
+                self._persist_classification(classified)
+            except Exception as e:
+                print(f"OpenAI mapping failed for tasks {list(pending)}: {e}")
+                classified = self._fallback_classification(list(pending))
+
+            self._merge_classification(result, pending, classified)
+
+        return self._cache_task_names(result)
+
+    async def anormalize_task_names(self, task_names: List[str],
+                                    client: Optional[AsyncOpenAI] = None) -> Dict[str, str]:
+        result, pending = self._resolve_task_names_locally(task_names)
+
+        if pending:
+            try:
+                response = await (client or async_openai_client).chat.completions.create(
+                    **self._classify_request(list(pending)))
+                classified = self._parse_classification(
+                    response.choices[0].message.content, list(pending))
+                self._persist_classification(classified)
+            except Exception as e:
+                print(f"OpenAI mapping failed for tasks {list(pending)}: {e}")
+                classified = self._fallback_classification(list(pending))
+
+            self._merge_classification(result, pending, classified)
+
+        return self._cache_task_names(result)
+
+    def _resolve_task_names_locally(self, task_names: List[str]) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+        result = {}
+        pending = {}
+
+        for task_name in task_names:
+            task_key = self._task_mapping_cache.get(task_name)
+            if task_key is not None:
+                result[task_name] = task_key
+                continue
+
+            task_name_lower = task_name.lower().strip()
+            task_key = self._task_mapping_cache.get(task_name_lower)
+            if task_key is None:
+                task_key = self._local_task_key(task_name_lower)
+            if task_key is None:
+                task_key = _task_name_cache.get(self._persisted_key(task_name_lower))
+
+            if task_key is None:
+                pending.setdefault(task_name_lower, []).append(task_name)
+            else:
+                result[task_name] = task_key
 
-        if task_key not in self.task_estimates:
-            return self._default_labor_estimate(task_name, area)
+        return result, pending
 
-        task_data = self.task_estimates[task_key]
-        skill_level = task_data["skill_level"]
-        base_rate = self.base_rates[skill_level]
+    def _local_task_key(self, task_name_lower: str) -> Optional[str]:
+        # Exact keys, then exact synonyms, then per-word typo fixes; None means
+        # ask OpenAI. The substring fallback is only used when OpenAI fails.
+        if task_name_lower in self.task_estimates:
+            return task_name_lower
 
-        hours = self._calculate_hours(task_key, area, complexity, task_data)
+        synonym_key = _TASK_NAME_MAP.get(task_name_lower)
+        if synonym_key in self.task_estimates:
+            return synonym_key
 
-        adjusted_rate = base_rate * urgency_factor
+        return _fuzzy_task_key(task_name_lower)
 
-        total = hours * adjusted_rate
+    def _persisted_key(self, task_name_lower: str) -> str:
+        return cache_key(DEFAULT_MODEL, task_name_lower, self._task_keys)
 
-        return Labor(
-            hours=hours,
-            rate=adjusted_rate,
-            total=total,
-            skill_level=skill_level,
-            workers_needed=task_data["workers_needed"]
-        )
+    def _persist_classification(self, classified: Dict[str, str]) -> None:
+        _task_name_cache.update({
+            self._persisted_key(task_name_lower): task_key
+            for task_name_lower, task_key in classified.items()
+        })
+
+    def _merge_classification(self, result: Dict[str, str], pending: Dict[str, List[str]],
+                              classified: Dict[str, str]) -> None:
+        for task_name_lower, task_key in classified.items():
+            self._task_mapping_cache[task_name_lower] = task_key
+            for task_name in pending[task_name_lower]:
+                result[task_name] = task_key
+
+    def _cache_task_names(self, result: Dict[str, str]) -> Dict[str, str]:
+        for task_name, task_key in result.items():
+            self._task_mapping_cache[task_name] = task_key
+        return result
+
+    def _classify_request(self, task_names: List[str]) -> Dict:
+        prompt = self._bulk_task_prompt.substitute(task_names=json.dumps(task_names))
+
+        return {
+            "model": DEFAULT_MODEL,
+            "messages": [
+                {"role": "system", "content": "You are a helpful construction task classifier. Return only JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.1,  # Low temperature for consistent results
+            "max_tokens": 50 + 20 * len(task_names),
+            "response_format": {"type": "json_object"}
+        }
+
+    def _parse_classification(self, content: str, task_names: List[str]) -> Dict[str, str]:
+        mapping = json.loads(content).get("mapping", {})
+
+        result = {}
+        for task_name in task_names:
+            mapped_task = str(mapping.get(task_name, "")).strip().lower()
+            result[task_name] = mapped_task if mapped_task in self.task_estimates else task_name
+        return result
+
+    def _fallback_classification(self, task_names: List[str]) -> Dict[str, str]:
+        return {
+            task_name: self._fallback_normalize_task_name(task_name)
+            for task_name in task_names
+        }
+
+    def _resolve_task(self, task_name: str) -> Tuple[str, Optional[Dict]]:
+        # Shares the mapping cache with calculate_labor, so a name already
+        # priced never triggers a second classification
+        task_key = self._normalize_task_name(task_name)
+        return task_key, self.task_estimates.get(task_key)
 
     def _normalize_task_name(self, task_name: str) -> str:
+        # Repeated names within a quote skip the lower()/strip() below
+        task_key = self._task_mapping_cache.get(task_name)
+        if task_key is None:
+            task_key = self._map_task_name(task_name)
+            self._task_mapping_cache[task_name] = task_key
+        return task_key
+
+    def _map_task_name(self, task_name: str) -> str:
         task_name_lower = task_name.lower().strip()
 
         # Check cache first
         if task_name_lower in self._task_mapping_cache:
             return self._task_mapping_cache[task_name_lower]
 
-        # Get available task keys from our estimates
-        available_tasks = list(self.task_estimates.keys())
-
-        # Create a prompt for OpenAI to map the task name
-        prompt = f"""
-You are a construction task classifier. Given a task description, map it to the most appropriate standard task category.
-
-Available standard task categories:
-{', '.join(available_tasks)}
+        local_key = self._local_task_key(task_name_lower)
+        if local_key is not None:
+            self._task_mapping_cache[task_name_lower] = local_key
+            return local_key
 
-Task to classify: "{task_name}"
+        persisted_key = self._persisted_key(task_name_lower)
+        persisted_task = _task_name_cache.get(persisted_key)
+        if persisted_task is not None:
+            self._task_mapping_cache[task_name_lower] = persisted_task
+            return persisted_task
 
-Instructions:
-- Return only the exact matching category name from the available list
-- If the task clearly matches a category, return that category
-- If no clear match exists, return the original task name in lowercase
-- Consider synonyms and common variations (e.g., "demo" -> "demolition", "paint job" -> "painting")
-
-Response format: Return only the category name, nothing else.
-"""
+        prompt = self._single_task_prompt.substitute(task_name=task_name)
 
         try:
             response = openai_client.chat.completions.create(
                 model=DEFAULT_MODEL,
                 messages=[
-                    {"role": "system", "content": "You are a helpful construction task classifier. Return only the category name."},
+                    {"role": "system", "content": "You are a helpful construction task classifier. Return only JSON."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.1,  # Low temperature for consistent results
-                max_tokens=50
+                max_tokens=20,
+                response_format=self._category_response_format
             )
 
-            mapped_task = response.choices[0].message.content.strip().lower()
+            mapped_task = json.loads(response.choices[0].message.content)["category"]
 
-            if mapped_task in available_tasks:
-                self._task_mapping_cache[task_name_lower] = mapped_task
-                return mapped_task
-            else:
-                self._task_mapping_cache[task_name_lower] = task_name_lower
-                return task_name_lower
+            if mapped_task not in self.task_estimates:
+                mapped_task = task_name_lower
+
+            self._task_mapping_cache[task_name_lower] = mapped_task
+            _task_name_cache.set(persisted_key, mapped_task)
+            return mapped_task
 
         except Exception as e:
             print(f"OpenAI mapping failed for task '{task_name}': {e}")
@@ -212,57 +547,13 @@ Response format: Return only the category name, nothing else.
             return fallback_result
 
     def _fallback_normalize_task_name(self, task_name: str) -> str:
-        mapping = {
-            "remove tiles": "tile_removal",
-            "tile removal": "tile_removal",
-            "remove old tiles": "tile_removal",
-            "demolition": "demolition",
-            "demo": "demolition",
-            "plumbing work": "plumbing",
-            "plumber": "plumbing",
-            "redo plumbing": "plumbing",
-            "electrical work": "electrical",
-            "electrician": "electrical",
-            "rewiring": "electrical",
-            "tiling": "tiling",
-            "tile installation": "tiling",
-            "lay tiles": "tiling",
-            "painting": "painting",
-            "paint": "painting",
-            "repaint": "painting",
-            "flooring": "flooring",
-            "floor installation": "flooring",
-            "lay flooring": "flooring",
-            "waterproofing": "waterproofing",
-            "waterproof": "waterproofing",
-            "install fixtures": "fixture_installation",
-            "fixture installation": "fixture_installation",
-            "install vanity": "fixture_installation",
-            "install toilet": "fixture_installation"
-        }
+        return _normalize_fallback(task_name)
 
-        return mapping.get(task_name, task_name)
-
-    def _calculate_hours(self, task_key: str, area: float,
-                         complexity: str, task_data: Dict) -> float:
-
-        base_hours = task_data["base_hours"]
-        complexity_multiplier = task_data["complexity_factors"].get(
-            complexity, 1.3)
-
-        if "hours_per_m2" in task_data:
-            variable_hours = task_data["hours_per_m2"] * area
-        elif "hours_per_fixture" in task_data:
-            fixtures = max(1, int(area / 2))  # Rough estimate
-            variable_hours = task_data["hours_per_fixture"] * fixtures
-        elif "hours_per_point" in task_data:
-            points = max(2, int(area))  # Minimum 2 points
-            variable_hours = task_data["hours_per_point"] * points
-        else:
-            # Fixed time tasks
-            variable_hours = 0
-
-        total_hours = (base_hours + variable_hours) * complexity_multiplier
+    def _calculate_hours(self, base_hours: float, variable_unit: int,
+                         variable_rate: float, complexity_multiplier: float,
+                         area: float) -> float:
+        total_hours = kernels.labor_hours(
+            base_hours, variable_unit, variable_rate, complexity_multiplier, float(area))
         return round(total_hours, 1)
 
     def _default_labor_estimate(self, task_name: str, area: float) -> Labor:
@@ -270,7 +561,7 @@ Response format: Return only the category name, nothing else.
         rate = self.base_rates["skilled"]
         total = hours * rate
 
-        return Labor(
+        return _construct_labor(
             hours=hours,
             rate=rate,
             total=total,
@@ -279,38 +570,28 @@ Response format: Return only the category name, nothing else.
         )
 
     def estimate_project_duration(self, tasks: list, overlap_factor: float = 0.7) -> str:
-        total_hours = sum(task.labor.hours for task in tasks)
+        return self.estimate_hours_duration(
+            [task.labor.hours for task in tasks], overlap_factor)
 
-        effective_hours = total_hours * overlap_factor
+    def estimate_labor_duration(self, labors: List[Labor], overlap_factor: float = 0.7) -> str:
+        return self.estimate_hours_duration(
+            [labor.hours for labor in labors], overlap_factor)
+
+    def estimate_hours_duration(self, hours: List[float], overlap_factor: float = 0.7) -> str:
+        effective_hours = math.fsum(hours) * overlap_factor
 
         # Convert to working days (8 hours per day)
         days = effective_hours / 8
 
-        if days <= 1:
-            return "1 day"
-        elif days <= 2:
-            return "1-2 days"
-        elif days <= 5:
-            return f"{int(days)}-{int(days)+1} days"
-        elif days <= 10:
-            return f"1-2 weeks"
-        else:
-            return f"{int(days/5)}-{int(days/5)+1} weeks"
+        return _DURATION_LABELS[bisect_left(_DURATION_BUCKETS, days)](days)
 
     def get_skill_requirements(self, task_name: str) -> Tuple[str, int]:
-        task_key = self._normalize_task_name(task_name)
+        _, task_data = self._resolve_task(task_name)
 
-        if task_key in self.task_estimates:
-            task_data = self.task_estimates[task_key]
+        if task_data is not None:
             return task_data["skill_level"], task_data["workers_needed"]
 
         return "skilled", 1  # Default
 
     def calculate_rush_surcharge(self, base_cost: float, urgency: str) -> float:
-        multipliers = {
-            "standard": 1.0,
-            "urgent": 1.25,      # 25% surcharge
-            "emergency": 1.5     # 50% surcharge
-        }
-
-        return base_cost * multipliers.get(urgency, 1.0)
+        return base_cost * _RUSH_MULTIPLIERS.get(urgency, 1.0)
@@ -1,10 +1,77 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+from functools import lru_cache, partial
+import sys
 from src.models import Material, MaterialCategory
 
 
+def _price_material(materials: Dict[str, Dict], material_name: str,
+                    quantity: float, variant: str) -> Material:
+    if material_name not in materials:
+        raise ValueError(
+            f"Material '{material_name}' not found in database")
+
+    material_data = materials[material_name]
+
+    if "variants" in material_data and variant in material_data["variants"]:
+        unit_price = material_data["variants"][variant]["price"]
+    else:
+        unit_price = material_data["base_price"]
+
+    total = quantity * unit_price
+
+    return Material.model_construct(
+        name=material_data["description"],
+        category=material_data["category"],
+        quantity=float(quantity),
+        unit=material_data["unit"],
+        unit_price=unit_price,
+        total=total,
+        supplier=material_data.get("supplier"),
+        availability_score=material_data.get("availability_score", 1.0)
+    )
+
+
+def _coverage_needs(materials: Dict[str, Dict], material_name: str, area: float) -> float:
+    if material_name not in materials:
+        return 0.0
+
+    material_data = materials[material_name]
+
+    # Coverage-based materials
+    coverage_per_unit = material_data.get("coverage", 1.0)
+    return max(1.0, area / coverage_per_unit)  # Minimum 1 unit
+
+
+def _task_materials(recipes: Dict, price_material: Callable[..., Material],
+                    task_type: str, area: float, budget_level: str) -> Tuple[Material, ...]:
+    return tuple(
+        price_material(
+            material_name, quantity(area), budget_level if by_budget else "basic")
+        for material_name, quantity, by_budget in recipes.get(task_type, ())
+    )
+
+
 class MaterialDatabase:
     def __init__(self):
         self.materials = self._initialize_materials()
+        # Every priced Material points at these, so share one copy of each
+        for material_data in self.materials.values():
+            for field in ("unit", "supplier", "description"):
+                material_data[field] = sys.intern(material_data[field])
+        # Parallel (name, category, base_price) columns for scans
+        self._names = tuple(self.materials)
+        self._categories = tuple(
+            data["category"] for data in self.materials.values())
+        self._base_prices = tuple(
+            data["base_price"] for data in self.materials.values())
+
+        # Material is frozen, so identical requests share one cached instance;
+        # the caches close over the data, not self
+        self._price_material_cached = lru_cache(maxsize=2048)(
+            partial(_price_material, self.materials))
+        self._recipes = self._initialize_recipes()
+        self._task_materials_cached = lru_cache(maxsize=256)(
+            partial(_task_materials, self._recipes, self._price_material_cached))
 
     def _initialize_materials(self) -> Dict[str, Dict]:
         return {
@@ -183,109 +250,47 @@ class MaterialDatabase:
 
     def get_material_price(self, material_name: str, quantity: float,
                            variant: str = "basic") -> Material:
-        if material_name not in self.materials:
-            raise ValueError(
-                f"Material '{material_name}' not found in database")
-
-        material_data = self.materials[material_name]
-
-        if "variants" in material_data and variant in material_data["variants"]:
-            unit_price = material_data["variants"][variant]["price"]
-        else:
-            unit_price = material_data["base_price"]
-
-        total = quantity * unit_price
-
-        return Material(
-            name=material_data["description"],
-            category=material_data["category"],
-            quantity=quantity,
-            unit=material_data["unit"],
-            unit_price=unit_price,
-            total=total,
-            supplier=material_data.get("supplier"),
-            availability_score=material_data.get("availability_score", 1.0)
-        )
+        return self._price_material_cached(material_name, quantity, variant)
 
     def estimate_coverage_needs(self, material_name: str, area: float) -> float:
-        if material_name not in self.materials:
-            return 0.0
-
-        material_data = self.materials[material_name]
+        return _coverage_needs(self.materials, material_name, area)
 
-        # Coverage-based materials
-        coverage_per_unit = material_data.get("coverage", 1.0)
-        return max(1.0, area / coverage_per_unit)  # Minimum 1 unit
+    def _initialize_recipes(self) -> Dict[str, Tuple[Tuple[str, Callable[[float], float], bool], ...]]:
+        # task type -> (material, quantity for a floor area, priced at budget level?)
+        coverage = partial(_coverage_needs, self.materials)
+        return {
+            "tiling": (
+                ("ceramic_floor_tiles", lambda area: area, True),
+                ("wall_tiles", lambda area: area * 3, True),  # Rough estimate
+                ("tile_adhesive", lambda area: coverage("tile_adhesive", area + area * 3), False),
+                ("grout", lambda area: coverage("grout", area + area * 3), False)
+            ),
+            "plumbing": (
+                ("toilet", lambda area: 1, True),
+                ("shower_mixer", lambda area: 1, True),
+                ("copper_pipes", lambda area: 10, False),
+                ("pvc_drain_pipe", lambda area: 3, False)
+            ),
+            "painting": (
+                # Walls height estimate
+                ("bathroom_paint", lambda area: coverage("bathroom_paint", area * 2.5), False),
+                ("primer", lambda area: coverage("primer", area * 2.5), False)
+            ),
+            "fixtures": (
+                ("vanity_sink", lambda area: 1, True),
+                ("bathroom_light_fixture", lambda area: 1, True)
+            )
+        }
 
     def get_task_materials(self, task_type: str, area: float = 4.0,
                            budget_level: str = "basic") -> List[Material]:
-        materials = []
-
-        if task_type == "tiling":
-            floor_tiles = self.get_material_price(
-                "ceramic_floor_tiles", area, budget_level
-            )
-            materials.append(floor_tiles)
-
-            wall_area = area * 3  # Rough estimate
-            wall_tiles = self.get_material_price(
-                "wall_tiles", wall_area, budget_level
-            )
-            materials.append(wall_tiles)
-
-            adhesive_bags = self.estimate_coverage_needs(
-                "tile_adhesive", area + wall_area)
-            adhesive = self.get_material_price("tile_adhesive", adhesive_bags)
-            materials.append(adhesive)
-
-            grout_bags = self.estimate_coverage_needs(
-                "grout", area + wall_area)
-            grout = self.get_material_price("grout", grout_bags)
-            materials.append(grout)
-
-        elif task_type == "plumbing":
-            toilet = self.get_material_price("toilet", 1, budget_level)
-            materials.append(toilet)
-
-            mixer = self.get_material_price("shower_mixer", 1, budget_level)
-            materials.append(mixer)
-
-            copper_pipes = self.get_material_price("copper_pipes", 10)
-            materials.append(copper_pipes)
-
-            drain_pipe = self.get_material_price("pvc_drain_pipe", 3)
-            materials.append(drain_pipe)
-
-        elif task_type == "painting":
-            paint_area = area * 2.5  # Walls height estimate
-            paint_liters = self.estimate_coverage_needs(
-                "bathroom_paint", paint_area)
-            paint = self.get_material_price("bathroom_paint", paint_liters)
-            materials.append(paint)
-
-            primer_liters = self.estimate_coverage_needs("primer", paint_area)
-            primer = self.get_material_price("primer", primer_liters)
-            materials.append(primer)
-
-        elif task_type == "fixtures":
-            vanity = self.get_material_price("vanity_sink", 1, budget_level)
-            materials.append(vanity)
-
-            light = self.get_material_price(
-                "bathroom_light_fixture", 1, budget_level)
-            materials.append(light)
-
-        return materials
+        return list(self._task_materials_cached(task_type, area, budget_level))
 
     def search_materials(self, category: Optional[MaterialCategory] = None,
                          max_price: Optional[float] = None) -> List[str]:
-        results = []
-
-        for name, data in self.materials.items():
-            if category and data["category"] != category:
-                continue
-            if max_price and data["base_price"] > max_price:
-                continue
-            results.append(name)
-
-        return results
+        return [
+            name for name, material_category, base_price in zip(
+                self._names, self._categories, self._base_prices)
+            if (not category or material_category == category) and
+            (not max_price or base_price <= max_price)
+        ]
@@ -1,5 +1,8 @@
 from typing import Dict, Tuple
 from enum import Enum
+from functools import lru_cache
+import math
+import re
 
 
 class VATCategory(Enum):
@@ -8,6 +11,14 @@ class VATCategory(Enum):
     REDUCED = "reduced"
 
 
+# Summary bucket for each VAT category
+_BREAKDOWN_KEYS = {
+    VATCategory.STANDARD: "standard_rate",
+    VATCategory.INTERMEDIATE: "intermediate_rate",
+    VATCategory.REDUCED: "reduced_rate"
+}
+
+
 class VATCalculator:
     def __init__(self):
         self.rates = {
@@ -26,6 +37,17 @@ class VATCalculator:
             "gas boiler", "oil boiler", "fuel boiler"
         }
 
+        self._energy_re = self._compile_terms(self.energy_renovation_tasks)
+        self._boiler_re = self._compile_terms(self.gas_oil_boiler_tasks)
+
+        # The category only depends on the task name, a few context fields and
+        # whether the project description mentions energy renovation
+        self._vat_category_cached = lru_cache(maxsize=1024)(self._compute_vat_category)
+
+    def _compile_terms(self, terms: set) -> re.Pattern:
+        return re.compile("|".join(
+            re.escape(term) for term in sorted(terms, key=len, reverse=True)))
+
     def calculate_vat(self, task_name: str, subtotal: float,
                       project_context: Dict = None) -> Tuple[float, float]:
         if project_context is None:
@@ -37,44 +59,56 @@ class VATCalculator:
         return vat_rate, vat_amount
 
     def _determine_vat_rate(self, task_name: str, context: Dict) -> float:
-        building_age = context.get("building_age_years", 10)
-        work_type = context.get("work_type", "renovation")
-        area_increase = context.get("area_increase_percent", 0)
-
+        return self.rates[self._determine_vat_category(task_name, context)]
+
+    def _determine_vat_category(self, task_name: str, context: Dict) -> VATCategory:
+        return self._vat_category_cached(
+            task_name,
+            context.get("building_age_years", 10),
+            context.get("work_type", "renovation"),
+            context.get("area_increase_percent", 0),
+            self._context_describes_energy_renovation(context)
+        )
+
+    def _compute_vat_category(self, task_name: str, building_age: float, work_type: str,
+                              area_increase: float, energy_described: bool) -> VATCategory:
         if self._is_new_construction(work_type, area_increase):
-            return self.rates[VATCategory.STANDARD]
+            return VATCategory.STANDARD
 
         if building_age < 2:
-            return self.rates[VATCategory.STANDARD]
+            return VATCategory.STANDARD
 
         if self._is_gas_oil_boiler(task_name):
-            return self.rates[VATCategory.STANDARD]
+            return VATCategory.STANDARD
 
-        if self._is_energy_renovation(task_name, context):
-            return self.rates[VATCategory.REDUCED]
+        if energy_described or self._energy_re.search(task_name.lower()):
+            return VATCategory.REDUCED
 
         if self._is_renovation_work(area_increase):
-            return self.rates[VATCategory.INTERMEDIATE]
+            return VATCategory.INTERMEDIATE
+
+        return VATCategory.STANDARD
+
+    def describes_energy_renovation(self, project_description: str) -> bool:
+        return bool(self._energy_re.search(project_description.lower()))
 
-        return self.rates[VATCategory.STANDARD]
+    def _context_describes_energy_renovation(self, context: Dict) -> bool:
+        # Callers pricing many tasks for one project store the flag once
+        # instead of rescanning the description for every task
+        if "energy_renovation_described" in context:
+            return context["energy_renovation_described"]
+        return self.describes_energy_renovation(context.get("project_description", ""))
 
     def _is_new_construction(self, work_type: str, area_increase: float) -> bool:
         return (work_type.lower() in ["new construction", "extension"] or
                 area_increase > 10)
 
     def _is_energy_renovation(self, task_name: str, context: Dict) -> bool:
-        task_lower = task_name.lower()
-        description = context.get("project_description", "").lower()
-
-        for energy_task in self.energy_renovation_tasks:
-            if energy_task in task_lower or energy_task in description:
-                return True
-
-        return False
+        return (bool(self._energy_re.search(task_name.lower())) or
+                self._context_describes_energy_renovation(context))
 
     def _is_gas_oil_boiler(self, task_name: str) -> bool:
-        task_lower = task_name.lower()
-        return any(boiler_type in task_lower for boiler_type in self.gas_oil_boiler_tasks)
+        return bool(self._boiler_re.search(task_name.lower()))
 
     def _is_renovation_work(self, area_increase: float) -> bool:
         return area_increase <= 10
@@ -83,49 +117,41 @@ class VATCalculator:
         if project_context is None:
             project_context = {}
 
-        summary = {
-            "tasks": [],
-            "total_before_vat": 0.0,
-            "total_vat": 0.0,
-            "total_with_vat": 0.0,
-            "vat_breakdown": {
-                "standard_rate": {"subtotal": 0.0, "vat": 0.0},
-                "intermediate_rate": {"subtotal": 0.0, "vat": 0.0},
-                "reduced_rate": {"subtotal": 0.0, "vat": 0.0}
-            }
-        }
+        task_rows = []
+        breakdown = {rate_key: ([], []) for rate_key in _BREAKDOWN_KEYS.values()}
 
         for task in tasks:
             task_subtotal = task.labor.total + \
-                sum(mat.total for mat in task.materials)
-            vat_rate, vat_amount = self.calculate_vat(
-                task.name, task_subtotal, project_context)
+                math.fsum([mat.total for mat in task.materials])
+            vat_category = self._determine_vat_category(task.name, project_context)
+            vat_rate = self.rates[vat_category]
+            vat_amount = task_subtotal * vat_rate
 
-            task_info = {
+            task_rows.append({
                 "task_name": task.name,
                 "subtotal": task_subtotal,
                 "vat_rate": vat_rate,
                 "vat_amount": vat_amount,
                 "total": task_subtotal + vat_amount
-            }
+            })
+
+            subtotals, vat_amounts = breakdown[_BREAKDOWN_KEYS[vat_category]]
+            subtotals.append(task_subtotal)
+            vat_amounts.append(vat_amount)
 
-            summary["tasks"].append(task_info)
-            summary["total_before_vat"] += task_subtotal
-            summary["total_vat"] += vat_amount
-
-            if vat_rate == 0.20:
-                summary["vat_breakdown"]["standard_rate"]["subtotal"] += task_subtotal
-                summary["vat_breakdown"]["standard_rate"]["vat"] += vat_amount
-            elif vat_rate == 0.10:
-                summary["vat_breakdown"]["intermediate_rate"]["subtotal"] += task_subtotal
-                summary["vat_breakdown"]["intermediate_rate"]["vat"] += vat_amount
-            elif vat_rate == 0.055:
-                summary["vat_breakdown"]["reduced_rate"]["subtotal"] += task_subtotal
-                summary["vat_breakdown"]["reduced_rate"]["vat"] += vat_amount
-
-        summary["total_with_vat"] = summary["total_before_vat"] + \
-            summary["total_vat"]
-        return summary
+        total_before_vat = math.fsum([row["subtotal"] for row in task_rows])
+        total_vat = math.fsum([row["vat_amount"] for row in task_rows])
+
+        return {
+            "tasks": task_rows,
+            "total_before_vat": total_before_vat,
+            "total_vat": total_vat,
+            "total_with_vat": total_before_vat + total_vat,
+            "vat_breakdown": {
+                rate_key: {"subtotal": math.fsum(subtotals), "vat": math.fsum(vat_amounts)}
+                for rate_key, (subtotals, vat_amounts) in breakdown.items()
+            }
+        }
 
     def explain_vat_rate(self, task_name: str, vat_rate: float, context: Dict = None) -> str:
         if context is None:
@@ -1,69 +1,154 @@
 import os
 import json
-from typing import Dict, List, Optional
-from src.models import TranscriptAnalysis
-from src.openai_client import openai_client, DEFAULT_MODEL
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from src.models import Completeness, TranscriptAnalysis
+from openai import AsyncOpenAI
+from src.openai_client import (
+    openai_client, async_openai_client, create_async_client, DEFAULT_MODEL)
+from src.cache import DiskCache, cache_key
 import re
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
-class TranscriptAnalyzer:
-    def __init__(self):
-        pass
 
-    def analyze_transcript(self, transcript: str) -> TranscriptAnalysis:
-        try:
-            system_prompt = self._get_system_prompt()
-            user_prompt = self._get_user_prompt(transcript)
-
-            response = openai_client.chat.completions.create(
-                model=DEFAULT_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.1,
-                max_tokens=1000
-            )
+# One pass over the transcript for every supported area unit
+_SIZE_RE = re.compile(
+    r'(\d+(?:\.\d+)?)\s*(?:m[²2]|sqm|square\s*meters?|metres?\s*carr[ée]s?)')
 
-            analysis_text = response.choices[0].message.content
-            analysis_data = self._parse_analysis_response(analysis_text)
-
-            return TranscriptAnalysis(
-                location=analysis_data.get("location", "Unknown"),
-                room_type=analysis_data.get("room_type", "bathroom"),
-                room_size=analysis_data.get("room_size", 4.0),
-                tasks_identified=analysis_data.get("tasks_identified", []),
-                budget_preference=analysis_data.get(
-                    "budget_preference", "moderate"),
-                special_requirements=analysis_data.get(
-                    "special_requirements", []),
-                clarity_score=analysis_data.get("clarity_score", 0.7),
-                raw_transcript=transcript
-            )
+# Outermost braces of a reply wrapped in prose or code fences
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
 
-        except Exception as e:
-            return self._get_fallback_analysis(transcript)
+# Whole-word city names so "nice" no longer matches inside "service"
+_CITY_RE = re.compile(
+    r"\b(paris|marseille|lyon|toulouse|nice|nantes|strasbourg|montpellier|bordeaux|lille|rennes)\b")
+
+_TASK_KEYWORDS = {
+    "remove tiles": ["remove tiles", "tile removal", "enlever carrelage"],
+    "plumbing": ["plumbing", "plomberie", "pipes", "shower", "toilet"],
+    "electrical": ["electrical", "électricité", "wiring", "lights"],
+    "tiling": ["tiles", "tiling", "carrelage", "lay tiles"],
+    "painting": ["paint", "painting", "peinture", "repaint"],
+    "install fixtures": ["vanity", "toilet", "fixtures", "install"]
+}
+
+# Checked in order, first level with a hit wins
+_BUDGET_KEYWORDS = {
+    "budget-conscious": ["budget", "cheap", "économique", "pas cher", "cost-effective"],
+    "premium": ["quality", "high-end", "premium", "qualité", "haut de gamme"],
+    "luxury": ["luxury", "luxe", "designer", "custom", "sur mesure"]
+}
+
+
+def _keyword_labels(keywords_by_label: Dict[str, List[str]]) -> Dict[str, Tuple[str, ...]]:
+    labels = {}
+    for label, keywords in keywords_by_label.items():
+        for keyword in keywords:
+            labels[keyword] = labels.get(keyword, ()) + (label,)
+    return labels
+
+
+def _keyword_re(labels: Dict[str, Tuple[str, ...]]) -> re.Pattern:
+    # A lookahead reports a match at every offset, so keywords nested in
+    # longer ones ("tiles" in "remove tiles") are still seen, like `in` did
+    return re.compile("(?=(" + "|".join(
+        re.escape(keyword) for keyword in sorted(labels, key=len, reverse=True)
+    ) + "))")
+
+
+def _find_keyword_labels(keyword_re: re.Pattern, labels: Dict[str, Tuple[str, ...]],
+                         transcript: str) -> set:
+    found = set()
+    for match in keyword_re.finditer(transcript):
+        found.update(labels[match.group(1)])
+    return found
+
+
+_TASK_LABELS = _keyword_labels(_TASK_KEYWORDS)
+_TASK_KEYWORD_RE = _keyword_re(_TASK_LABELS)
+
+# One branch per level in priority order; each lazily scans the whole transcript,
+# so a later level is only tried when every earlier one has no hit anywhere
+_BUDGET_GROUPS = {label.replace("-", "_"): label for label in _BUDGET_KEYWORDS}
+_BUDGET_RE = re.compile("|".join(
+    f"^.*?(?P<{group}>" + "|".join(
+        re.escape(keyword) for keyword in _BUDGET_KEYWORDS[label]) + ")"
+    for group, label in _BUDGET_GROUPS.items()
+), re.DOTALL)
+
+
+class _TranscriptView(NamedTuple):
+    lower: str
+    n_words: int
+
+
+def _transcript_view(transcript: str) -> _TranscriptView:
+    return _TranscriptView(transcript.lower(), len(transcript.split()))
+
+
+class _JsonObjectScanner:
+    """Buffers streamed text until the first top-level JSON object closes."""
 
-    def _get_system_prompt(self) -> str:
-        return """
-You are an expert renovation analyst. 
+    def __init__(self):
+        self._parts = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> Optional[str]:
+        for index, char in enumerate(text):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = self._depth > 0
+            elif char == "{":
+                self._depth += 1
+            elif char == "}" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(text[:index + 1])
+                    return "".join(self._parts)
+
+        self._parts.append(text)
+        return None
+
+    def text(self) -> str:
+        return "".join(self._parts)
+
+
+# The model answers with short keys to save output tokens; see _ANALYSIS_KEYS
+_SYSTEM_PROMPT = """
+You are an expert renovation analyst.
 Your job is to analyze voice transcripts from clients describing their renovation needs and extract structured information.
 
-You must respond with a JSON object containing these fields:
-- location: The city/location mentioned (or "Unknown" if not specified)
-- room_type: Type of room being renovated (bathroom, kitchen, etc.)
-- room_size: Estimated size in square meters (extract or estimate based on description)
-- tasks_identified: List of renovation tasks mentioned (e.g. ["remove tiles", "plumbing work", "install vanity"])
-- budget_preference: Client's budget preference ("budget-conscious", "moderate", "premium", "luxury")
-- special_requirements: Any special needs or constraints mentioned
-- clarity_score: Score from 0.0 to 1.0 indicating how clear and complete the transcript is
+You must respond with a flat JSON object containing these keys:
+- loc: The city/location mentioned (or "Unknown" if not specified)
+- rt: Type of room being renovated (bathroom, kitchen, etc.)
+- sz: Estimated size in square meters (extract or estimate based on description)
+- tasks: List of renovation tasks mentioned (e.g. ["remove tiles", "plumbing work", "install vanity"])
+- bud: Client's budget preference ("budget-conscious", "moderate", "premium", "luxury")
+- req: List of any special needs or constraints mentioned
+- cs: Score from 0.0 to 1.0 indicating how clear and complete the transcript is
+
+Example:
+{"loc": "Paris", "rt": "bathroom", "sz": 4, "tasks": ["remove tiles", "install vanity"], "bud": "moderate", "req": [], "cs": 0.8}
 
 Guidelines:
 - Extract explicit information first
 - Make reasonable inferences where information is missing
 - Use standard renovation terminology
-        # Room size patterns
-        - For room sizes, typical French bathroom sizes are 2-6sqm
+- For room sizes, typical French bathroom sizes are 2-6sqm
 - Budget preferences can be inferred from language like "budget-conscious", "quality materials", etc.
 - Common bathroom tasks: demolition, plumbing, electrical, tiling, painting, fixture installation
 - Be conservative with inferences - if unsure, use default values
@@ -71,28 +156,272 @@ Guidelines:
 Respond only with valid JSON.
 """
 
+_ANALYSIS_KEYS = {
+    "loc": "location",
+    "rt": "room_type",
+    "sz": "room_size",
+    "tasks": "tasks_identified",
+    "bud": "budget_preference",
+    "req": "special_requirements",
+    "cs": "clarity_score"
+}
+
+
+# Default gpt-4o-mini tier-1 limits; async requests wait for budget up front
+# rather than hitting 429s and paying for retries
+_REQUESTS_PER_MINUTE = 500
+_TOKENS_PER_MINUTE = 200_000
+
+
+class _TokenRateLimiter:
+    """Token bucket over requests and estimated tokens per minute."""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed_minutes = (now - self._updated) / 60
+        self._updated = now
+
+        self._requests = min(self.requests_per_minute,
+                             self._requests + elapsed_minutes * self.requests_per_minute)
+        self._tokens = min(self.tokens_per_minute,
+                           self._tokens + elapsed_minutes * self.tokens_per_minute)
+
+    def _try_acquire(self, tokens: int) -> float:
+        # Returns 0 once the budget is debited, else the seconds to wait. The
+        # lock keeps threads and event-loop tasks from spending the same budget
+        tokens = min(tokens, self.tokens_per_minute)
+        with self._lock:
+            self._refill()
+            if self._requests >= 1 and self._tokens >= tokens:
+                self._requests -= 1
+                self._tokens -= tokens
+                return 0.0
+
+            return 60 * max(
+                (1 - self._requests) / self.requests_per_minute,
+                (tokens - self._tokens) / self.tokens_per_minute)
+
+    async def acquire(self, tokens: int) -> None:
+        while True:
+            delay = self._try_acquire(tokens)
+            if not delay:
+                return
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self, tokens: int) -> None:
+        while True:
+            delay = self._try_acquire(tokens)
+            if not delay:
+                return
+            time.sleep(delay)
+
+
+def _longest_first(transcripts: List[str]) -> List[int]:
+    return sorted(range(len(transcripts)), key=lambda i: -len(transcripts[i]))
+
+
+def _in_original_order(order: List[int], results: List) -> List:
+    restored = [None] * len(order)
+    for index, result in zip(order, results):
+        restored[index] = result
+    return restored
+
+
+# Validated analysis fields keyed by model, system prompt and transcript, so
+# reruns and repeated transcripts skip the API round-trip
+_analysis_cache = DiskCache("transcript_analysis_data")
+
+
+class TranscriptAnalyzer:
+    def __init__(self):
+        # Shared by every request; only the user message varies per transcript
+        self._system_message = {"role": "system", "content": _SYSTEM_PROMPT}
+        self._rate_limiter = _TokenRateLimiter(
+            _REQUESTS_PER_MINUTE, _TOKENS_PER_MINUTE)
+
+    def analyze_transcript(self, transcript: str) -> TranscriptAnalysis:
+        try:
+            key = self._response_key(transcript)
+            analysis = self._cached_analysis(key, transcript)
+            if analysis is None:
+                analysis = self._cache_analysis(
+                    key, self._stream_completion(transcript), transcript)
+
+            return analysis
+
+        except Exception as e:
+            print(f"Transcript analysis failed, using fallback extraction: {e}")
+            return self._get_fallback_analysis(transcript)
+
+    async def analyze_transcript_async(self, transcript: str,
+                                       client: Optional[AsyncOpenAI] = None) -> TranscriptAnalysis:
+        try:
+            key = self._response_key(transcript)
+            analysis = self._cached_analysis(key, transcript)
+            if analysis is None:
+                analysis = self._cache_analysis(
+                    key, await self._stream_completion_async(transcript, client), transcript)
+
+            return analysis
+
+        except Exception as e:
+            print(f"Transcript analysis failed, using fallback extraction: {e}")
+            return self._get_fallback_analysis(transcript)
+
+    def _stream_completion(self, transcript: str) -> str:
+        # Stop reading as soon as the JSON object closes; trailing prose is dropped
+        # and the connection is released early
+        scanner = _JsonObjectScanner()
+        request = self._get_completion_request(transcript)
+        self._rate_limiter.acquire_sync(self._estimate_tokens(request))
+
+        stream = openai_client.chat.completions.create(**request, stream=True)
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    content = scanner.feed(chunk.choices[0].delta.content)
+                    if content is not None:
+                        return content
+        finally:
+            stream.close()
+
+        return scanner.text()
+
+    async def _stream_completion_async(self, transcript: str,
+                                       client: Optional[AsyncOpenAI] = None) -> str:
+        scanner = _JsonObjectScanner()
+        request = self._get_completion_request(transcript)
+        await self._rate_limiter.acquire(self._estimate_tokens(request))
+
+        stream = await (client or async_openai_client).chat.completions.create(
+            **request, stream=True)
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    content = scanner.feed(chunk.choices[0].delta.content)
+                    if content is not None:
+                        return content
+        finally:
+            await stream.close()
+
+        return scanner.text()
+
+    def _cached_analysis(self, key: str, transcript: str) -> Optional[TranscriptAnalysis]:
+        analysis_data = _analysis_cache.get(key)
+        if analysis_data is None:
+            return None
+        return self._analysis_from_data(analysis_data, transcript)
+
+    def _cache_analysis(self, key: str, response_text: str, transcript: str) -> TranscriptAnalysis:
+        # Parse and validate before caching, so a truncated or malformed reply
+        # raises here and is never persisted
+        analysis_data = self._extract_analysis_data(response_text)
+        if analysis_data is None:
+            raise ValueError("Analysis reply contains no JSON object")
+
+        analysis = self._analysis_from_data(analysis_data, transcript)
+        _analysis_cache.set(key, analysis.model_dump(exclude={"raw_transcript"}))
+        return analysis
+
+    def _response_key(self, transcript: str) -> str:
+        return cache_key(DEFAULT_MODEL, _SYSTEM_PROMPT, transcript)
+
+    def _get_completion_request(self, transcript: str) -> Dict:
+        return {
+            "model": DEFAULT_MODEL,
+            "messages": [
+                self._system_message,
+                {"role": "user", "content": self._get_user_prompt(transcript)}
+            ],
+            "temperature": 0.1,
+            "max_tokens": self._max_tokens(transcript),
+            "response_format": {"type": "json_object"}
+        }
+
+    def _estimate_tokens(self, request: Dict) -> int:
+        # ~4 characters per prompt token, plus the full completion budget
+        prompt_chars = sum(len(message["content"]) for message in request["messages"])
+        return prompt_chars // 4 + request["max_tokens"]
+
+    def _max_tokens(self, transcript: str) -> int:
+        return min(1000, 200 + len(transcript.split()) * 2)
+
+    def _build_analysis(self, analysis_text: str, transcript: str) -> TranscriptAnalysis:
+        return self._analysis_from_data(
+            self._parse_analysis_response(analysis_text), transcript)
+
+    def _analysis_from_data(self, analysis_data: Dict, transcript: str) -> TranscriptAnalysis:
+        return TranscriptAnalysis(
+            location=analysis_data.get("location", "Unknown"),
+            room_type=analysis_data.get("room_type", "bathroom"),
+            room_size=analysis_data.get("room_size", 4.0),
+            tasks_identified=analysis_data.get("tasks_identified", []),
+            budget_preference=analysis_data.get(
+                "budget_preference", "moderate"),
+            special_requirements=analysis_data.get(
+                "special_requirements", []),
+            clarity_score=analysis_data.get("clarity_score", 0.7),
+            raw_transcript=transcript
+        )
+
     def _get_user_prompt(self, transcript: str) -> str:
         return f"""
 Please analyze this renovation transcript and extract the information as JSON:
 
 Transcript: "{transcript}"
 
+Remember to respond with valid JSON only.
+"""
+
+    def _get_user_prompt_batch(self, transcripts: List[str]) -> str:
+        numbered = "\n".join(
+            f'{index}) "{transcript}"' for index, transcript in enumerate(transcripts, 1))
+
+        return f"""
+Please analyze each of these renovation transcripts and extract the information as JSON:
+
+Transcripts:
+{numbered}
+
+Return a JSON object {{"analyses": [...]}} whose list holds {len(transcripts)} objects in the
+format above, one per transcript, same order.
 Remember to respond with valid JSON only.
 """
 
     def _parse_analysis_response(self, response_text: str) -> Dict:
+        analysis_data = self._extract_analysis_data(response_text)
+        if analysis_data is None:
+            return self._get_default_analysis_data()
+        return analysis_data
+
+    def _extract_analysis_data(self, response_text: str) -> Optional[Dict]:
+        # The prompt asks for bare JSON, so only slice out the object on a miss
         try:
-            json_start = response_text.find('{')
-            json_end = response_text.rfind('}') + 1
+            analysis_data = _json_loads(response_text)
+            if isinstance(analysis_data, dict):
+                return self._expand_analysis_keys(analysis_data)
+        except ValueError:
+            pass
 
-            if json_start != -1 and json_end != -1:
-                json_text = response_text[json_start:json_end]
-                return json.loads(json_text)
-            else:
-                return json.loads(response_text)
+        match = _JSON_OBJECT_RE.search(response_text)
+        if match is None:
+            return None
 
-        except json.JSONDecodeError:
-            return self._get_default_analysis_data()
+        try:
+            return self._expand_analysis_keys(_json_loads(match.group(0)))
+        except ValueError:
+            return None
+
+    def _expand_analysis_keys(self, analysis_data: Dict) -> Dict:
+        return {_ANALYSIS_KEYS.get(key, key): value for key, value in analysis_data.items()}
 
     def _get_default_analysis_data(self) -> Dict:
         return {
@@ -106,18 +435,17 @@ Remember to respond with valid JSON only.
         }
 
     def _get_fallback_analysis(self, transcript: str) -> TranscriptAnalysis:
-        transcript_lower = transcript.lower()
+        view = _transcript_view(transcript)
 
-        location = self._extract_location_fallback(transcript_lower)
+        location = self._extract_location_fallback(view.lower)
 
-        room_size = self._extract_room_size_fallback(transcript_lower)
+        room_size = self._extract_room_size_fallback(view.lower)
 
-        tasks = self._extract_tasks_fallback(transcript_lower)
+        tasks = self._extract_tasks_fallback(view.lower)
 
-        budget = self._extract_budget_fallback(transcript_lower)
+        budget = self._extract_budget_fallback(view.lower)
 
-        clarity_score = min(
-            1.0, len(transcript.split()) / 20)
+        clarity_score = min(1.0, view.n_words / 20)
 
         return TranscriptAnalysis(
             location=location,
@@ -131,29 +459,13 @@ Remember to respond with valid JSON only.
         )
 
     def _extract_location_fallback(self, transcript: str) -> str:
-        french_cities = [
-            "paris", "marseille", "lyon", "toulouse", "nice", "nantes",
-            "strasbourg", "montpellier", "bordeaux", "lille", "rennes"
-        ]
-
-        for city in french_cities:
-            if city in transcript:
-                return city.title()
-
-        return "Unknown"
+        match = _CITY_RE.search(transcript)
+        return match.group(1).title() if match else "Unknown"
 
     def _extract_room_size_fallback(self, transcript: str) -> float:
-        size_patterns = [
-            r'(\d+(?:\.\d+)?)\s*m[²2]',
-            r'(\d+(?:\.\d+)?)\s*sqm',
-            r'(\d+(?:\.\d+)?)\s*square\s*meters?',
-            r'(\d+(?:\.\d+)?)\s*metres?\s*carr[ée]s?'
-        ]
-
-        for pattern in size_patterns:
-            match = re.search(pattern, transcript)
-            if match:
-                return float(match.group(1))
+        match = _SIZE_RE.search(transcript)
+        if match:
+            return float(match.group(1))
 
         if any(word in transcript for word in ["small", "petite", "tiny"]):
             return 3.0
@@ -163,52 +475,179 @@ Remember to respond with valid JSON only.
             return 4.0  # Average bathroom size
 
     def _extract_tasks_fallback(self, transcript: str) -> List[str]:
-        task_keywords = {
-            "remove tiles": ["remove tiles", "tile removal", "enlever carrelage"],
-            "plumbing": ["plumbing", "plomberie", "pipes", "shower", "toilet"],
-            "electrical": ["electrical", "électricité", "wiring", "lights"],
-            "tiling": ["tiles", "tiling", "carrelage", "lay tiles"],
-            "painting": ["paint", "painting", "peinture", "repaint"],
-            "install fixtures": ["vanity", "toilet", "fixtures", "install"]
-        }
-
-        identified_tasks = []
-
-        for task, keywords in task_keywords.items():
-            if any(keyword in transcript for keyword in keywords):
-                identified_tasks.append(task)
+        found = _find_keyword_labels(_TASK_KEYWORD_RE, _TASK_LABELS, transcript)
+        identified_tasks = [task for task in _TASK_KEYWORDS if task in found]
 
         return identified_tasks if identified_tasks else ["renovation"]
 
     def _extract_budget_fallback(self, transcript: str) -> str:
-        budget_keywords = {
-            "budget-conscious": ["budget", "cheap", "économique", "pas cher", "cost-effective"],
-            "premium": ["quality", "high-end", "premium", "qualité", "haut de gamme"],
-            "luxury": ["luxury", "luxe", "designer", "custom", "sur mesure"]
-        }
-
-        for budget_level, keywords in budget_keywords.items():
-            if any(keyword in transcript for keyword in keywords):
-                return budget_level
+        match = _BUDGET_RE.match(transcript)
+        if match:
+            return _BUDGET_GROUPS[match.lastgroup]
 
         return "moderate"  # Default
 
-    def analyze_batch(self, transcripts: List[str]) -> List[TranscriptAnalysis]:
-        results = []
+    def analyze_batch(self, transcripts: List[str], max_concurrency: int = 8,
+                      mode: str = "live", batch_rows: int = 1) -> List[TranscriptAnalysis]:
+        if mode == "batch":
+            return self._analyze_batch_offline(transcripts)
+
+        if mode == "threads":
+            # Sync client on worker threads; usable where an event loop is already running
+            order = _longest_first(transcripts)
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                analyses = list(executor.map(
+                    self.analyze_transcript, [transcripts[i] for i in order]))
+            return _in_original_order(order, analyses)
+
+        return asyncio.run(self._analyze_batch_in_new_loop(
+            transcripts, max_concurrency, batch_rows))
+
+    async def _analyze_batch_in_new_loop(self, transcripts: List[str], max_concurrency: int = 8,
+                                         batch_rows: int = 1) -> List[TranscriptAnalysis]:
+        # asyncio.run starts a fresh loop each call, and the shared async client's
+        # connection pool belongs to whichever loop used it first
+        async with create_async_client() as client:
+            return await self.analyze_batch_async(
+                transcripts, max_concurrency, batch_rows, client)
+
+    def _analyze_batch_offline(self, transcripts: List[str],
+                               poll_interval: float = 30.0) -> List[TranscriptAnalysis]:
+        # OpenAI Batch API: cheaper and off the live rate limits, but results
+        # can take up to the 24h completion window
+        try:
+            requests = "\n".join(
+                json.dumps({
+                    "custom_id": str(index),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._get_completion_request(transcript)
+                })
+                for index, transcript in enumerate(transcripts)
+            )
 
-        for transcript in transcripts:
-            analysis = self.analyze_transcript(transcript)
-            results.append(analysis)
+            input_file = openai_client.files.create(
+                file=("transcripts.jsonl", requests.encode("utf-8")), purpose="batch")
+            batch = openai_client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
 
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                time.sleep(poll_interval)
+                batch = openai_client.batches.retrieve(batch.id)
+
+            contents = {}
+            if batch.output_file_id:
+                output = openai_client.files.content(batch.output_file_id).text
+                for line in output.splitlines():
+                    result = json.loads(line)
+                    response = result.get("response") or {}
+                    if response.get("status_code") == 200:
+                        contents[result["custom_id"]] = \
+                            response["body"]["choices"][0]["message"]["content"]
+
+        except Exception as e:
+            print(f"Batch analysis failed, analyzing live instead: {e}")
+            return asyncio.run(self._analyze_batch_in_new_loop(transcripts))
+
+        results = []
+        for index, transcript in enumerate(transcripts):
+            content = contents.get(str(index))
+            if content is None:
+                results.append(self._get_fallback_analysis(transcript))
+            else:
+                results.append(self._build_analysis(content, transcript))
         return results
 
-    def get_analysis_summary(self, analysis: TranscriptAnalysis) -> Dict[str, any]:
+    async def analyze_batch_async(self, transcripts: List[str], max_concurrency: int = 8,
+                                  batch_rows: int = 1,
+                                  client: Optional[AsyncOpenAI] = None) -> List[TranscriptAnalysis]:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def analyze(transcript: str) -> TranscriptAnalysis:
+            async with semaphore:
+                return await self.analyze_transcript_async(transcript, client)
+
+        # Semaphore waiters are served in order, so the slowest requests start first
+        # and short ones fill the tail
+        order = _longest_first(transcripts)
+        transcripts = [transcripts[i] for i in order]
+
+        if batch_rows <= 1:
+            analyses = await asyncio.gather(*(analyze(transcript) for transcript in transcripts))
+            return _in_original_order(order, analyses)
+
+        # Pack batch_rows transcripts into each prompt to get past per-request rate limits
+        async def analyze_rows(rows: List[str]) -> List[TranscriptAnalysis]:
+            async with semaphore:
+                analyses = await self._analyze_rows_async(rows, client)
+            if analyses is None:
+                return await asyncio.gather(*(analyze(transcript) for transcript in rows))
+            return analyses
+
+        chunks = await asyncio.gather(*(
+            analyze_rows(transcripts[start:start + batch_rows])
+            for start in range(0, len(transcripts), batch_rows)
+        ))
+        return _in_original_order(
+            order, [analysis for chunk in chunks for analysis in chunk])
+
+    async def _analyze_rows_async(self, transcripts: List[str],
+                                  client: Optional[AsyncOpenAI] = None) -> Optional[List[TranscriptAnalysis]]:
+        try:
+            keys = [self._response_key(transcript) for transcript in transcripts]
+            analyses = [self._cached_analysis(key, transcript)
+                        for key, transcript in zip(keys, transcripts)]
+            pending = [index for index, analysis in enumerate(analyses) if analysis is None]
+            if not pending:
+                return analyses
+
+            pending_transcripts = [transcripts[index] for index in pending]
+            request = {
+                "model": DEFAULT_MODEL,
+                "messages": [
+                    self._system_message,
+                    {"role": "user", "content": self._get_user_prompt_batch(pending_transcripts)}
+                ],
+                "temperature": 0.1,
+                "max_tokens": sum(self._max_tokens(transcript) for transcript in pending_transcripts),
+                "response_format": {"type": "json_object"}
+            }
+            await self._rate_limiter.acquire(self._estimate_tokens(request))
+
+            response = await (client or async_openai_client).chat.completions.create(**request)
+
+            rows = _json_loads(response.choices[0].message.content).get("analyses")
+
+            if not isinstance(rows, list) or len(rows) != len(pending) or \
+                    not all(isinstance(row, dict) for row in rows):
+                return None
+
+            # Validate every row before caching any, so a bad reply persists nothing
+            parsed = [self._analysis_from_data(self._expand_analysis_keys(row), transcript)
+                      for row, transcript in zip(rows, pending_transcripts)]
+            for index, analysis in zip(pending, parsed):
+                _analysis_cache.set(keys[index], analysis.model_dump(exclude={"raw_transcript"}))
+                analyses[index] = analysis
+            return analyses
+
+        except Exception as e:
+            print(f"Row-marshaled analysis failed, analyzing individually: {e}")
+            return None
+
+    def get_analysis_summary(self, analysis: TranscriptAnalysis,
+                             expand_completeness: bool = True) -> Dict[str, any]:
+        # Batch reports can keep the Completeness bitmask and skip the per-analysis dict
+        completeness = self._assess_data_completeness(analysis)
+
         return {
             "extraction_quality": "Good" if analysis.clarity_score > 0.7 else "Needs Review",
             "location_confidence": "High" if analysis.location != "Unknown" else "Low",
             "task_count": len(analysis.tasks_identified),
             "estimated_project_scope": self._estimate_project_scope(analysis),
-            "data_completeness": self._assess_data_completeness(analysis)
+            "data_completeness": completeness.as_dict() if expand_completeness else completeness
         }
 
     def _estimate_project_scope(self, analysis: TranscriptAnalysis) -> str:
@@ -222,11 +661,18 @@ Remember to respond with valid JSON only.
         else:
             return "Small renovation"
 
-    def _assess_data_completeness(self, analysis: TranscriptAnalysis) -> Dict[str, bool]:
-        return {
-            "has_location": analysis.location != "Unknown",
-            "has_dimensions": analysis.room_size > 0,
-            "has_tasks": len(analysis.tasks_identified) > 0,
-            "has_budget_info": analysis.budget_preference != "moderate",
-            "has_special_requirements": len(analysis.special_requirements) > 0
-        }
+    def _assess_data_completeness(self, analysis: TranscriptAnalysis) -> Completeness:
+        flags = 0
+
+        if analysis.location != "Unknown":
+            flags |= Completeness.LOCATION
+        if analysis.room_size > 0:
+            flags |= Completeness.DIMENSIONS
+        if analysis.tasks_identified:
+            flags |= Completeness.TASKS
+        if analysis.budget_preference != "moderate":
+            flags |= Completeness.BUDGET
+        if analysis.special_requirements:
+            flags |= Completeness.SPECIAL_REQUIREMENTS
+
+        return Completeness(flags)
@@ -0,0 +1,81 @@
+import os
+import unittest
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from src.transcript.analyzer import TranscriptAnalyzer, _JsonObjectScanner
+
+
+class FallbackExtractionTest(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = TranscriptAnalyzer()
+
+    def test_budget_levels_are_checked_in_priority_order(self):
+        cases = {
+            "luxury finish but it has to be cheap": "budget-conscious",
+            "designer fittings, high-end tiles": "premium",
+            "sur mesure vanity": "luxury",
+            "just a normal bathroom": "moderate",
+        }
+        for transcript, budget in cases.items():
+            with self.subTest(transcript=transcript):
+                self.assertEqual(self.analyzer._extract_budget_fallback(transcript), budget)
+
+    def test_room_size_units(self):
+        cases = {
+            "about 4.5 m² in total": 4.5,
+            "a 6m2 room": 6.0,
+            "roughly 8 sqm": 8.0,
+            "10 square meters": 10.0,
+            "7 metres carrés": 7.0,
+            "a tiny bathroom": 3.0,
+            "a bathroom": 4.0,
+        }
+        for transcript, size in cases.items():
+            with self.subTest(transcript=transcript):
+                self.assertEqual(self.analyzer._extract_room_size_fallback(transcript), size)
+
+    def test_cities_match_whole_words(self):
+        cases = {
+            "flat in lyon, 3rd floor": "Lyon",
+            "we live in nice": "Nice",
+            "a nicer bathroom please": "Unknown",
+            "parisian style": "Unknown",
+        }
+        for transcript, location in cases.items():
+            with self.subTest(transcript=transcript):
+                self.assertEqual(self.analyzer._extract_location_fallback(transcript), location)
+
+
+class JsonObjectScannerTest(unittest.TestCase):
+    REPLY = 'Sure: {"loc": "Lyon", "req": ["}{ \\" {"], "nested": {"sz": 3}} and more text {"x": 1}'
+    OBJECT_END = REPLY.index("}} and") + 2
+
+    def test_stops_at_the_first_top_level_object(self):
+        scanner = _JsonObjectScanner()
+        self.assertEqual(scanner.feed(self.REPLY), self.REPLY[:self.OBJECT_END])
+
+    def test_streamed_input_split_at_every_offset(self):
+        for split in range(1, len(self.REPLY)):
+            with self.subTest(split=split):
+                scanner = _JsonObjectScanner()
+                head = scanner.feed(self.REPLY[:split])
+                result = head if head is not None else scanner.feed(self.REPLY[split:])
+                self.assertEqual(result, self.REPLY[:self.OBJECT_END])
+
+    def test_character_stream(self):
+        scanner = _JsonObjectScanner()
+        results = [scanner.feed(char) for char in self.REPLY[:self.OBJECT_END]]
+
+        self.assertEqual(results[:-1], [None] * (self.OBJECT_END - 1))
+        self.assertEqual(results[-1], self.REPLY[:self.OBJECT_END])
+
+    def test_unclosed_object_is_returned_by_text(self):
+        scanner = _JsonObjectScanner()
+        self.assertIsNone(scanner.feed('{"loc": "Ly'))
+        self.assertIsNone(scanner.feed('on", "sz": {'))
+        self.assertEqual(scanner.text(), '{"loc": "Lyon", "sz": {')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import math
+import unittest
+
+from src.pricing.confidence import ConfidenceScorer
+
+
+class MaterialAvailabilityTest(unittest.TestCase):
+    def setUp(self):
+        self.scorer = ConfidenceScorer()
+
+    def test_entries_are_availability_stability_reliability_tuples(self):
+        materials = [(0.9, 0.8, 0.85), (0.6, 0.5, 0.4)]
+        expected = math.fsum(
+            availability * 0.5 + stability * 0.3 + reliability * 0.2
+            for availability, stability, reliability in materials) / len(materials)
+
+        score = self.scorer._score_material_availability({"materials_list": materials})
+
+        self.assertAlmostEqual(score, expected, places=12)
+
+    def test_weights_apply_to_the_matching_column(self):
+        self.assertAlmostEqual(self.scorer._score_material_availability(
+            {"materials_list": [(1.0, 0.0, 0.0)]}), 0.5)
+        self.assertAlmostEqual(self.scorer._score_material_availability(
+            {"materials_list": [(0.0, 1.0, 0.0)]}), 0.3)
+        self.assertAlmostEqual(self.scorer._score_material_availability(
+            {"materials_list": [(0.0, 0.0, 1.0)]}), 0.2)
+
+    def test_missing_or_empty_list_is_neutral(self):
+        self.assertEqual(self.scorer._score_material_availability({}), 0.5)
+        self.assertEqual(self.scorer._score_material_availability({"materials_list": []}), 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import unittest
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from src.engine import DonizoPricingEngine, _FALLBACK_TASK_MAPPING
+from src.models import TaskType, TranscriptAnalysis
+
+
+def _analysis(tasks, **fields):
+    values = {
+        "location": "Paris",
+        "room_type": "bathroom",
+        "room_size": 4.0,
+        "tasks_identified": tasks,
+        "budget_preference": "moderate",
+        "special_requirements": [],
+        "clarity_score": 0.8,
+        "raw_transcript": "",
+    }
+    values.update(fields)
+    return TranscriptAnalysis(**values)
+
+
+class TaskPlanTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = DonizoPricingEngine()
+
+    def test_known_names_resolve_locally_and_only_unknown_ones_are_sent(self):
+        known, names, context = self.engine._prepare_task_plan(
+            _analysis(["Plumbing work", " Retile Backsplash "]))
+
+        self.assertEqual(known, {"Plumbing work": _FALLBACK_TASK_MAPPING["plumbing work"]})
+        self.assertEqual(names, frozenset({"retile backsplash"}))
+        self.assertIsNone(context)
+
+    def test_project_context_is_only_sent_when_no_tasks_were_identified(self):
+        known, names, context = self.engine._prepare_task_plan(
+            _analysis([], special_requirements=["wheelchair access", "eco"]))
+
+        self.assertEqual(known, {})
+        self.assertEqual(names, frozenset())
+        self.assertEqual(context, ("bathroom", 4.0, "Paris", "moderate",
+                                   ("eco", "wheelchair access")))
+
+    def test_plan_mapping_merges_with_known_names(self):
+        painting = {"task_key": "painting", "task_type": "painting"}
+        mappings, defaults = self.engine._resolve_task_plan(
+            ["Plumbing work", " Retile Backsplash ", "Unmapped"],
+            {"Plumbing work": _FALLBACK_TASK_MAPPING["plumbing work"]},
+            {"mapping": {"retile backsplash": painting}, "defaults": [{"name": "ignored"}]})
+
+        self.assertEqual(mappings, {
+            "Plumbing work": _FALLBACK_TASK_MAPPING["plumbing work"],
+            " Retile Backsplash ": painting,
+        })
+        self.assertEqual(defaults, [])
+
+    def test_defaults_are_used_when_nothing_maps(self):
+        mappings, defaults = self.engine._resolve_task_plan([], {}, {"defaults": [
+            {"name": "Paint walls", "task_key": "painting", "task_type": "painting"},
+            {"name": "Mystery", "task_key": "mystery", "task_type": "unknown"},
+        ]})
+
+        self.assertEqual(mappings, {})
+        self.assertEqual(defaults, [
+            ("Paint walls", "painting", TaskType.PAINTING),
+            ("Mystery", "mystery", TaskType.FIXTURES),
+        ])
+
+    def test_fallback_mapping_matches_whole_phrases(self):
+        mappings = self.engine._fallback_task_mapping(
+            ["Redo plumbing in the shower", "Lay tiles", "Repaint", "Build a sauna"])
+
+        self.assertEqual(mappings["Redo plumbing in the shower"]["task_key"], "plumbing")
+        self.assertEqual(mappings["Lay tiles"]["task_key"], "tiling")
+        self.assertEqual(mappings["Repaint"]["task_key"], "painting")
+        self.assertEqual(mappings["Build a sauna"],
+                         {"task_key": "build a sauna", "task_type": "fixtures"})
+
+    def test_failed_plan_falls_back_without_defaults(self):
+        mappings, defaults = self.engine._fallback_task_plan(
+            _analysis(["remove tiles"]), RuntimeError("offline"))
+
+        self.assertEqual(mappings, {"remove tiles": _FALLBACK_TASK_MAPPING["remove tiles"]})
+        self.assertEqual(defaults, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
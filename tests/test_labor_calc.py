@@ -0,0 +1,76 @@
+import os
+import unittest
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from src.pricing.labor_calc import LaborCalculator, _fuzzy_task_key
+
+
+class LocalTaskKeyTest(unittest.TestCase):
+    def setUp(self):
+        self.calculator = LaborCalculator()
+
+    def test_exact_keys_and_synonyms_resolve_locally(self):
+        cases = {
+            "painting": "painting",
+            "tile_removal": "tile_removal",
+            "remove old tiles": "tile_removal",
+            "install toilet": "fixture_installation",
+        }
+        for task_name, task_key in cases.items():
+            with self.subTest(task_name=task_name):
+                self.assertEqual(self.calculator._local_task_key(task_name), task_key)
+
+    def test_misspellings_map_to_their_task(self):
+        cases = {
+            "pluming": "plumbing",
+            "plumbng work": "plumbing",
+            "paintng": "painting",
+            "electircal": "electrical",
+            "waterprofing": "waterproofing",
+            "demolision": "demolition",
+            "remove tilles": "tile_removal",
+            "instal vanity": "fixture_installation",
+        }
+        for task_name, task_key in cases.items():
+            with self.subTest(task_name=task_name):
+                self.assertEqual(_fuzzy_task_key(task_name), task_key)
+                self.assertEqual(self.calculator._local_task_key(task_name), task_key)
+
+    def test_near_misses_fall_through_to_openai(self):
+        for task_name in ("toilet_installation", "toilet_removal", "remove toilet",
+                          "door_installation", "door installation", "floor_tiling",
+                          "lighting", "paint walls", "repaint the ceiling"):
+            with self.subTest(task_name=task_name):
+                self.assertIsNone(_fuzzy_task_key(task_name))
+                self.assertIsNone(self.calculator._local_task_key(task_name))
+
+
+class DurationTest(unittest.TestCase):
+    def setUp(self):
+        self.calculator = LaborCalculator()
+
+    def test_working_day_buckets(self):
+        cases = {
+            4: "1 day",
+            8: "1 day",
+            12: "1-2 days",
+            16: "1-2 days",
+            24: "3-4 days",
+            40: "5-6 days",
+            48: "1-2 weeks",
+            80: "1-2 weeks",
+            120: "3-4 weeks",
+        }
+        for hours, duration in cases.items():
+            with self.subTest(hours=hours):
+                self.assertEqual(
+                    self.calculator.estimate_hours_duration([hours], overlap_factor=1.0), duration)
+
+    def test_overlap_applies_to_the_summed_hours(self):
+        # 3 * 8h at the default 0.7 overlap is 2.1 working days
+        self.assertEqual(self.calculator.estimate_hours_duration([8, 8, 8]), "2-3 days")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from types import SimpleNamespace
+
+from src.pricing.vat_rules import VATCalculator
+
+
+def _task(name, labor_total, material_totals):
+    return SimpleNamespace(
+        name=name,
+        labor=SimpleNamespace(total=labor_total),
+        materials=[SimpleNamespace(total=total) for total in material_totals])
+
+
+class VATSummaryTest(unittest.TestCase):
+    def setUp(self):
+        self.calculator = VATCalculator()
+
+    def test_tasks_land_in_their_rate_bucket(self):
+        summary = self.calculator.get_vat_summary([
+            _task("Paint walls", 100.0, [50.0]),
+            _task("Install heat pump", 1000.0, []),
+            _task("Replace gas boiler", 200.0, [300.0]),
+            _task("Plumbing work", 10.0, [40.0]),
+        ])
+
+        self.assertEqual([row["vat_rate"] for row in summary["tasks"]],
+                         [0.10, 0.055, 0.20, 0.10])
+        self.assertEqual(summary["vat_breakdown"], {
+            "standard_rate": {"subtotal": 500.0, "vat": 100.0},
+            "intermediate_rate": {"subtotal": 200.0, "vat": 20.0},
+            "reduced_rate": {"subtotal": 1000.0, "vat": 55.0},
+        })
+
+    def test_new_construction_and_recent_buildings_pay_the_standard_rate(self):
+        for context in ({"work_type": "extension"}, {"area_increase_percent": 25},
+                        {"building_age_years": 1}):
+            with self.subTest(context=context):
+                rate, _ = self.calculator.calculate_vat("Install heat pump", 100.0, context)
+                self.assertEqual(rate, 0.20)
+
+    def test_energy_renovation_in_the_description_reduces_every_task(self):
+        context = {"project_description": "We also want better INSULATION"}
+        self.assertEqual(self.calculator.calculate_vat("Paint walls", 100.0, context)[0], 0.055)
+
+        # The engine stores the description match once per quote
+        context["energy_renovation_described"] = False
+        self.assertEqual(self.calculator.calculate_vat("Paint walls", 100.0, context)[0], 0.10)
+
+    def test_totals_are_exactly_rounded_sums(self):
+        tasks = [_task("Paint walls", 0.1, [0.1] * 9) for _ in range(10)]
+        summary = self.calculator.get_vat_summary(tasks)
+
+        self.assertEqual(summary["tasks"][0]["subtotal"], 1.0)
+        self.assertEqual(summary["total_before_vat"], 10.0)
+        self.assertEqual(summary["total_vat"], 1.0)
+        self.assertEqual(summary["total_with_vat"], 11.0)
+        self.assertEqual(summary["vat_breakdown"]["intermediate_rate"],
+                         {"subtotal": 10.0, "vat": 1.0})
+
+
+if __name__ == "__main__":
+    unittest.main()